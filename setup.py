@@ -228,6 +228,12 @@ extensions = [
         extra_compile_args=extra_compile_args,
         extra_link_args=extra_link_args,
     ),
+    Extension(
+        name="tofu.data._mesh_bsplines_rect_cy",
+        sources=["tofu/data/_mesh_bsplines_rect_cy.pyx"],
+        extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
+    ),
     Extension(
         name="tofu.geom._openmp_tools",
         sources=["tofu/geom/_openmp_tools.pyx"],
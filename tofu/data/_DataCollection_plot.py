@@ -12,6 +12,7 @@ from matplotlib import gridspec
 import matplotlib as mpl
 import matplotlib.transforms as transforms
 import matplotlib.lines as mlines
+import matplotlib.collections as mcollections
 # from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 # tofu
@@ -702,7 +703,15 @@ def plot_axvline(
     )
 
     # Prepare data
-    unique = sorted(set([din[k0][sortby] for k0 in key]))
+    unique, iunique = np.unique(
+        [din[k0][sortby] for k0 in key],
+        return_inverse=True,
+    )
+    unique = unique.tolist()
+    lkey = [
+        [key[jj] for jj in np.flatnonzero(iunique == ii)]
+        for ii in range(len(unique))
+    ]
     ny = len(unique)
     dy = (ymax-ymin)/ny
     ly = [(ymin+ii*dy, ymin+(ii+1)*dy) for ii in range(ny)]
@@ -718,10 +727,7 @@ def plot_axvline(
         colors = []
         sizes = []
         for ii, uu in enumerate(unique):
-            lk = [
-                k0 for k0 in key
-                if din[k0][sortby] == uu and k0 in dsize.keys()
-            ]
+            lk = [k0 for k0 in lkey[ii] if k0 in dsize.keys()]
             if len(lk) > 0:
                 x.append([din[k0][param_x] for k0 in lk])
                 y.append([ly[ii][0]+fraction*dy/2. for k0 in lk])
@@ -734,9 +740,14 @@ def plot_axvline(
         colors = np.concatenate(colors).ravel()
 
     # plot preparation
-    lamb = [din[k0][param_x] for k0 in key]
-    Dlamb = np.nanmax(lamb) - np.nanmin(lamb)
-    xlim = [np.nanmin(lamb) - 0.05*Dlamb, np.nanmax(lamb) + 0.05*Dlamb]
+    lamb = np.fromiter(
+        (din[k0][param_x] for k0 in key),
+        dtype=float,
+        count=len(key),
+    )
+    lambmin, lambmax = np.nanmin(lamb), np.nanmax(lamb)
+    Dlamb = lambmax - lambmin
+    xlim = [lambmin - 0.05*Dlamb, lambmax + 0.05*Dlamb]
     ax = _ax_axvline(
         ax=ax, figsize=figsize, dmargin=dmargin,
         quant=param_x, units=units, xlim=xlim,
@@ -748,17 +759,14 @@ def plot_axvline(
     )
 
     # plot
+    segments, lcolors = [], []
     for ii, uu in enumerate(unique):
-        lk = [k0 for k0 in key if din[k0][sortby] == uu]
-        for k0 in lk:
-            ll = ax.axvline(
-                x=din[k0][param_x],
-                ymin=ly[ii][0],
-                ymax=ly[ii][0] + fraction*dy,
-                c=dcolor[uu],
-                ls=ls,
-                lw=lw,
-            )
+        for k0 in lkey[ii]:
+            segments.append([
+                (din[k0][param_x], ly[ii][0]),
+                (din[k0][param_x], ly[ii][0] + fraction*dy),
+            ])
+            lcolors.append(dcolor[uu])
 
             ax.text(
                 din[k0][param_x],
@@ -783,6 +791,20 @@ def plot_axvline(
             transform=blend,
         )
 
+    # all vertical lines as a single artist (x in data, y in axes coords)
+    lc = mcollections.LineCollection(
+        segments,
+        colors=lcolors,
+        linestyles=ls,
+        linewidths=lw,
+        transform=ax.get_xaxis_transform(),
+    )
+    ax.add_collection(lc, autolim=False)
+    if len(segments) > 0:
+        xs = np.array(segments)[:, 0, 0]
+        ax.update_datalim(np.array([xs, xs]).T, updatey=False)
+        ax.autoscale_view(scaley=False)
+
     # Add markers
     if dsize is not None:
         ax.scatter(
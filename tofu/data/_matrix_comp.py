@@ -158,7 +158,8 @@ def compute(
 
         if verb:
             nmax = len(f"Geometry matrix, channel {nlos} / {nlos}")
-            nn = 10**(np.log10(nlos)-1)
+            # refresh progress at most every 1% of channels
+            nstep = max(1, nlos // 100)
 
         # prepare indices
         indbs = coll.select_ind(
@@ -174,7 +175,7 @@ def compute(
         for ii in range(nlos):
 
             # verb
-            if verb:
+            if verb and (ii % nstep == 0 or ii == nlos - 1):
                 msg = f"Geom. matrix, chan {ii+1} / {nlos}".ljust(nmax)
                 end = '\n' if ii == nlos-1 else '\r'
                 print(msg, end=end, flush=True)
@@ -2,11 +2,13 @@
 
 
 # Built-in
+import importlib
 
 
 # Common
 import numpy as np
 import scipy.interpolate as scpinterp
+import scipy.sparse as scpsp
 
 
 # specific
@@ -14,6 +16,31 @@ from . import _generic_check
 from . import _mesh_bsplines_operators_rect
 
 
+# optional
+# numba is slow to import => only imported on first ev_sum(), see _get_nb()
+_mesh_bsplines_rect_nb = None
+try:
+    from . import _mesh_bsplines_rect_cy
+except Exception:
+    _mesh_bsplines_rect_cy = False
+
+
+def _get_nb():
+    """ Return the numba kernels module, False if numba is not available
+
+    Imported on first call only
+    """
+    global _mesh_bsplines_rect_nb
+    if _mesh_bsplines_rect_nb is None:
+        try:
+            _mesh_bsplines_rect_nb = importlib.import_module(
+                f'{__package__}._mesh_bsplines_rect_nb',
+            )
+        except Exception:
+            _mesh_bsplines_rect_nb = False
+    return _mesh_bsplines_rect_nb
+
+
 # #############################################################################
 # #############################################################################
 #                       BivariateSplineRect - scipy subclass
@@ -29,72 +56,68 @@ class BivariateSplineRect(scpinterp.BivariateSpline):
     Used self.set_coefs() to update
     """
 
-    def __init__(self, knotsR=None, knotsZ=None, deg=None, shapebs=None):
+    def __init__(
+        self,
+        knotsR=None,
+        knotsZ=None,
+        deg=None,
+        shapebs=None,
+        knots_per_bs_x=None,
+        knots_per_bs_y=None,
+    ):
 
         assert np.allclose(np.unique(knotsR), knotsR)
         assert np.allclose(np.unique(knotsZ), knotsZ)
         assert deg in [0, 1, 2, 3]
 
-        # get knots pr bs
-        self._get_knots_per_bs_for_basis_elements(
-            knotsR=knotsR,
-            knotsZ=knotsZ,
-            deg=deg,
-        )
+        # knots per bs, only needed by overlap / operators => built on demand
+        # unless already available
+        self._knots_per_bs_x = knots_per_bs_x
+        self._knots_per_bs_y = knots_per_bs_y
 
         # full knots with multiplicity
-        knotsR, nbsR = _get_bs2d_func_knots(
+        knotsR_mult, nbsR = _get_bs2d_func_knots(
             knotsR, deg=deg, returnas='data', return_unique=True,
         )
-        knotsZ, nbsZ = _get_bs2d_func_knots(
+        knotsZ_mult, nbsZ = _get_bs2d_func_knots(
             knotsZ, deg=deg, returnas='data', return_unique=True,
         )
 
         coefs = np.ones((nbsR*nbsZ,), dtype=float)
 
         self.__nbs = (nbsR, nbsZ)
-        self.tck = [knotsR, knotsZ, coefs]
+        self.tck = [knotsR_mult, knotsZ_mult, coefs]
         self.degrees = [deg, deg]
 
+        # polynomial coefs of non-zero bsplines per span, for evaluation
+        self.knotsR = np.asarray(knotsR, dtype=float)
+        self.knotsZ = np.asarray(knotsZ, dtype=float)
+        self.polyR = _get_bs1d_poly(self.knotsR, knotsR_mult, deg=deg)
+        self.polyZ = _get_bs1d_poly(self.knotsZ, knotsZ_mult, deg=deg)
+
         # shapebs
         self.shapebs = shapebs
 
-    def _get_knots_per_bs_for_basis_elements(
-        self,
-        knotsR=None,
-        knotsZ=None,
-        deg=None,
-    ):
-
-        # added for details
-        knots_per_bs_x = _get_bs2d_func_knots(knotsR, deg=deg, returnas='data')
-        knots_per_bs_y = _get_bs2d_func_knots(knotsZ, deg=deg, returnas='data')
-
-        self.knots_per_bs_x = knots_per_bs_x
-        self.knots_per_bs_y = knots_per_bs_y
+    @property
+    def knots_per_bs_x(self):
+        """ (nknots_per_bs, nbsR) knots of each bspline along R
 
-        if deg == 0:
-            pass
-        else:
-            knots_per_bs_x = np.concatenate(
-                (
-                    np.tile(knots_per_bs_x[0, :] - 1, (deg, 1)),
-                    knots_per_bs_x,
-                    np.tile(knots_per_bs_x[-1, :] + 1, (deg, 1)),
-                ),
-                axis=0,
+        Row k holds the knots of rank k of all bsplines (contiguous)
+        """
+        if self._knots_per_bs_x is None:
+            self._knots_per_bs_x = _get_bs2d_func_knots(
+                self.knotsR, deg=self.degrees[0], returnas='data',
             )
-            knots_per_bs_y = np.concatenate(
-                (
-                    np.tile(knots_per_bs_y[0, :] - 1, (deg, 1)),
-                    knots_per_bs_y,
-                    np.tile(knots_per_bs_y[-1, :] + 1, (deg, 1)),
-                ),
-                axis=0,
+        return self._knots_per_bs_x
+
+    @property
+    def knots_per_bs_y(self):
+        """ (nknots_per_bs, nbsZ) knots of each bspline along Z """
+        if self._knots_per_bs_y is None:
+            self._knots_per_bs_y = _get_bs2d_func_knots(
+                self.knotsZ, deg=self.degrees[1], returnas='data',
             )
-
-        self.knots_per_bs_x_pad = np.asfortranarray(knots_per_bs_x)
-        self.knots_per_bs_y_pad = np.asfortranarray(knots_per_bs_y)
+        return self._knots_per_bs_y
 
     def set_coefs(
         self,
@@ -158,13 +181,157 @@ class BivariateSplineRect(scpinterp.BivariateSpline):
         val[indout] = np.nan
         return val
 
+    def get_design_matrix(self, x, y):
+        """ Return the (npts, nbsR*nbsZ) sparse design matrix at (x, y)
+
+        Each row only has the (deg+1)**2 non-zero bsplines of the point
+        Rows of points outside the mesh are filled with nan
+
+        Not cached: it can be passed back to ev_sum() / ev_details() (dmat=)
+        to evaluate several times at the same points
+        """
+
+        deg = self.degrees[0]
+        nbsR, nbsZ = self.__nbs
+        npts = x.size
+
+        # spans and non-zero 1d bsplines
+        iR, valR = _get_bs1d_nonzero(x.ravel(), self.knotsR, self.polyR)
+        iZ, valZ = _get_bs1d_nonzero(y.ravel(), self.knotsZ, self.polyZ)
+
+        # tensor product
+        ind = np.arange(0, deg + 1)
+        col = (
+            (iR[:, None, None] + ind[None, :, None])*nbsZ
+            + (iZ[:, None, None] + ind[None, None, :])
+        )
+        data = valR[:, :, None] * valZ[:, None, :]
+        indptr = np.arange(0, npts + 1)*(deg + 1)**2
+
+        return scpsp.csr_matrix(
+            (data.ravel(), col.ravel(), indptr),
+            shape=(npts, nbsR*nbsZ),
+        )
+
+    def _ev_sum_scalar(self, x, y, coefs=None, out=None):
+        """ Sum of all bsplines with the same scalar coef, without crop
+
+        bsplines are a partition of unity inside the mesh
+        """
+
+        if out is None:
+            val = np.full((1,) + x.shape, coefs, dtype=float)
+        else:
+            val = out
+            val.fill(coefs)
+        indout = (
+            (x < self.knotsR[0]) | (x > self.knotsR[-1])
+            | (y < self.knotsZ[0]) | (y > self.knotsZ[-1])
+        )
+        val[0, indout] = np.nan
+        return val
+
+    def ev_sum(
+        self,
+        x,
+        y,
+        coefs=None,
+        cropbs_neg=None,
+        out=None,
+        dmat=None,
+    ):
+        """ Return the sum of all bsplines for each time step
+
+        Uses a compiled kernel (numba, or cython if built) if available,
+        the sparse design matrix otherwise
+        All time steps are computed at once
+
+        coefs is either a scalar or a (nt, nbsR, nbsZ) array
+        cropbs_neg is a (nbsR, nbsZ) bool array of bsplines to be ignored
+        out is an optional (nt, x.shape) C-contiguous float array, filled
+        in-place and returned (avoids allocations in repeated calls)
+        dmat is an optional design matrix of (x, y), from get_design_matrix()
+        If provided, it is used instead of the compiled kernels
+
+        Return a (nt, x.shape) array (nan outside of the mesh)
+        """
+
+        # -----------
+        # prepare
+
+        if np.isscalar(coefs):
+            if cropbs_neg is None:
+                if out is not None:
+                    _ev_check_out(out=out, shape=(1,) + x.shape)
+                return self._ev_sum_scalar(x, y, coefs=coefs, out=out)
+            coefs = np.full((1,) + self.__nbs, coefs, dtype=float)
+        if cropbs_neg is not None:
+            coefs = np.copy(coefs)
+            coefs[:, cropbs_neg] = 0.
+
+        nt = coefs.shape[0]
+        shape = tuple(np.r_[nt, x.shape])
+        if out is not None:
+            _ev_check_out(out=out, shape=shape)
+        if dmat is not None:
+            _ev_check_dmat(dmat=dmat, shape=(x.size, coefs[0].size))
+
+        # -----------
+        # compute
+
+        if dmat is not None:
+            eval_sum = None
+        elif _get_nb() is not False:
+            eval_sum = _mesh_bsplines_rect_nb.get_eval_sum(self.degrees[0])
+        elif _mesh_bsplines_rect_cy is not False:
+            eval_sum = _mesh_bsplines_rect_cy.eval_sum
+        else:
+            eval_sum = None
+
+        if eval_sum is not None:
+            if out is None:
+                val = np.empty((nt, x.size), dtype=float)
+            else:
+                val = out.reshape((nt, x.size))
+            eval_sum(
+                np.ascontiguousarray(x.ravel(), dtype=float),
+                np.ascontiguousarray(y.ravel(), dtype=float),
+                self.knotsR,
+                self.knotsZ,
+                self.polyR,
+                self.polyZ,
+                np.ascontiguousarray(coefs, dtype=float),
+                val,
+            )
+            return val.reshape(shape) if out is None else out
+
+        if dmat is None:
+            dmat = self.get_design_matrix(x, y)
+        val = dmat.dot(coefs.reshape((nt, -1)).T)
+        if out is None:
+            return val.T.reshape(shape)
+        out.reshape((nt, x.size))[...] = val.T
+        return out
+
     def ev_details(
         self,
         x,
         y,
         indbs_tuple_flat=None,
         reshape=None,
+        returnas=None,
+        dmat=None,
     ):
+        """ Return the value of each selected bspline at each point
+
+        returnas:
+            - np.ndarray: dense (x.shape, nbs) array, or (npts, nbs)
+            - 'sparse': (npts, nbs) csr_matrix, only non-zero values stored,
+                reshape is ignored
+
+        dmat is an optional design matrix of (x, y), from get_design_matrix()
+
+        """
 
         # -----------
         # check input
@@ -187,68 +354,49 @@ class BivariateSplineRect(scpinterp.BivariateSpline):
             types=bool,
         )
 
+        returnas = _generic_check._check_var(
+            returnas, 'returnas',
+            default=np.ndarray,
+            allowed=[np.ndarray, 'sparse'],
+        )
+
+        if dmat is not None:
+            _ev_check_dmat(
+                dmat=dmat,
+                shape=(x.size, self.__nbs[0]*self.__nbs[1]),
+            )
+
         # -----------
         # prepare
 
         deg = self.degrees[0]
         nbs = indbs_tuple_flat[0].size
         shape = x.shape
-        x = np.ascontiguousarray(x.ravel(), dtype=np.floating)
-        y = np.ascontiguousarray(y.ravel(), dtype=np.floating)
-        coef = np.zeros((deg + 4, 1), dtype=float)
-        coef[deg] = 1.
-        outy = np.full((x.size, 1), np.nan)
+
+        # position of each bspline in the output, -1 if not selected
+        pos = -np.ones((self.__nbs[0]*self.__nbs[1],), dtype=int)
+        pos[
+            indbs_tuple_flat[0]*self.__nbs[1] + indbs_tuple_flat[1]
+        ] = np.arange(0, nbs)
 
         # -----------
         # compute
 
-        val = np.zeros(tuple(np.r_[x.size, nbs]))
-        indtot = np.arange(0, nbs)
-
-        iz_u = np.unique(indbs_tuple_flat[1])
-
-        for iz in iz_u:
-
-            scpinterp._bspl.evaluate_spline(
-                self.knots_per_bs_y_pad[:, iz],
-                coef,
-                self.degrees[1],
-                y,
-                0,
-                False,
-                outy,
+        # each point only sees the (deg+1)**2 bsplines of its span
+        if dmat is None:
+            dmat = self.get_design_matrix(x, y)
+        rows = np.repeat(np.arange(0, x.size), (deg + 1)**2)
+        pos = pos[dmat.indices]
+        indok = (pos >= 0) & ~np.isnan(dmat.data)
+
+        if returnas == 'sparse':
+            return scpsp.csr_matrix(
+                (dmat.data[indok], (rows[indok], pos[indok])),
+                shape=(x.size, nbs),
             )
 
-            indoky = ~np.isnan(outy)
-            if not np.any(indoky):
-                continue
-            indokx = np.copy(indoky)
-
-            indr = indbs_tuple_flat[1] == iz
-            ir = indbs_tuple_flat[0][indr]
-            for ii, iir in enumerate(ir):
-
-                if ii > 0:
-                    indokx[...] = indoky
-
-                outx = np.full((indoky.sum(), 1), np.nan)
-
-                scpinterp._bspl.evaluate_spline(
-                    self.knots_per_bs_x_pad[:, iir],
-                    coef,
-                    self.degrees[0],
-                    x[indoky[:, 0]],
-                    0,
-                    False,
-                    outx,
-                )
-
-                ixok = ~np.isnan(outx)
-                if not np.any(ixok):
-                    continue
-
-                indokx[indoky] = ixok[:, 0]
-                val[indokx[:, 0], indtot[indr][ii]] = (outx[ixok]*outy[indokx])
+        val = np.zeros((x.size, nbs), dtype=float)
+        val[rows[indok], pos[indok]] = dmat.data[indok]
 
         if reshape:
             val = np.reshape(val, tuple(np.r_[shape, -1]))
@@ -293,6 +441,96 @@ class BivariateSplineRect(scpinterp.BivariateSpline):
         )
 
 
+# #############################################################################
+# #############################################################################
+#                       Mesh2DRect - bsplines - 1d non-zero
+# #############################################################################
+
+
+def _get_bs1d_deboor(x, knots=None, deg=None, ispan=None):
+    """ Return the deg+1 non-zero bsplines at each x, for known spans
+
+    knots is the full knots vector (with multiplicity)
+    ispan is the index in knots of the span of each x
+    Uses the Cox - de Boor forward recurrence, vectorized on x
+
+    Return a (npts, deg+1) array, values of bsplines ispan-deg to ispan
+    """
+
+    val = np.zeros((x.size, deg + 1), dtype=float)
+    val[:, 0] = 1.
+    left = np.zeros((x.size, deg + 1), dtype=float)
+    right = np.zeros((x.size, deg + 1), dtype=float)
+    for jj in range(1, deg + 1):
+        left[:, jj] = x - knots[ispan + 1 - jj]
+        right[:, jj] = knots[ispan + jj] - x
+        saved = 0.
+        for rr in range(jj):
+            temp = val[:, rr] / (right[:, rr + 1] + left[:, jj - rr])
+            val[:, rr] = saved + right[:, rr + 1] * temp
+            saved = left[:, jj - rr] * temp
+        val[:, jj] = saved
+
+    return val
+
+
+def _get_bs1d_poly(knots, knots_mult, deg=None):
+    """ Return the polynomial coefs of the non-zero bsplines on each span
+
+    knots are the unique knots, knots_mult the knots with multiplicity
+    On span ii, with u = (x - knots[ii]) / (knots[ii+1] - knots[ii]),
+    bspline ii+jj is: sum_kk poly[ii, jj, kk] * u**kk
+
+    Return a (nspans, deg+1, deg+1) array
+    """
+
+    nspans = knots.size - 1
+
+    # sample deg+1 points inside each span
+    uu = (np.arange(0, deg + 1) + 0.5) / (deg + 1)
+    dx = np.diff(knots)
+    xx = (knots[:-1, None] + uu[None, :] * dx[:, None]).ravel()
+    ispan = np.repeat(np.arange(0, nspans), deg + 1) + deg
+
+    val = _get_bs1d_deboor(xx, knots=knots_mult, deg=deg, ispan=ispan)
+    val = val.reshape((nspans, deg + 1, deg + 1))
+
+    # invert vandermonde: val[ii, uu, jj] = sum_kk poly[ii, jj, kk] uu**kk
+    vand = uu[:, None] ** np.arange(0, deg + 1)[None, :]
+    poly = np.einsum('kl,ilj->ijk', np.linalg.inv(vand), val)
+    return np.ascontiguousarray(poly)
+
+
+def _get_bs1d_nonzero(x, knots=None, poly=None):
+    """ Return the span index and the deg+1 non-zero bsplines at each x
+
+    knots are the unique knots and poly the output of _get_bs1d_poly()
+    Evaluates the polynomial of each span with Horner's scheme
+
+    Return:
+        - ispan: (npts,) int array, index of the first non-zero bspline
+        - val: (npts, deg+1) array, values of bsplines ispan to ispan+deg
+    Points outside of the knots have val = nan
+    """
+
+    deg = poly.shape[-1] - 1
+
+    # span: knots[ispan] <= x < knots[ispan+1], right edge included
+    ispan = np.searchsorted(knots, x, side='right') - 1
+    indout = (x < knots[0]) | (x > knots[-1])
+    ispan = np.clip(ispan, 0, knots.size - 2)
+
+    # Horner
+    uu = (x - knots[ispan]) / (knots[ispan + 1] - knots[ispan])
+    pp = poly[ispan, :, :]
+    val = pp[:, :, deg]
+    for kk in range(deg - 1, -1, -1):
+        val = val * uu[:, None] + pp[:, :, kk]
+
+    val[indout, :] = np.nan
+    return ispan, val
+
+
 # #############################################################################
 # #############################################################################
 #                       Mesh2DRect - bsplines - overlap
@@ -335,8 +573,64 @@ def _get_overlap(
 # #############################################################################
 
 
+def _ev_check_coefs(coefs=None, shapebs=None):
+    """ Return coefs as a scalar or a (nt, nbsR, nbsZ) array """
+
+    if coefs is None:
+        return 1.
+    if np.isscalar(coefs):
+        return coefs
+
+    if not isinstance(coefs, np.ndarray):
+        coefs = np.atleast_1d(coefs)
+    if coefs.shape == shapebs:
+        return coefs[None, ...]
+    if coefs.ndim != len(shapebs) + 1 or coefs.shape[1:] != shapebs:
+        msg = (
+            "coefs has wrong shape!\n"
+            f"\t- coefs.shape: {coefs.shape}\n"
+            f"\t- shapebs:     {shapebs}"
+        )
+        raise Exception(msg)
+    return coefs
+
+
+def _ev_check_out(out=None, shape=None):
+    """ Check out is a C-contiguous float array of the expected shape """
+
+    c0 = (
+        isinstance(out, np.ndarray)
+        and out.shape == shape
+        and out.dtype == np.float64
+        and out.flags['C_CONTIGUOUS']
+    )
+    if not c0:
+        msg = (
+            "Arg out must be a C-contiguous float np.ndarray!\n"
+            f"\t- expected shape: {shape}\n"
+            f"\t- provided: {out}"
+        )
+        raise Exception(msg)
+
+
+def _ev_check_dmat(dmat=None, shape=None):
+    """ Check dmat is a design matrix of the expected shape """
+
+    c0 = (
+        scpsp.isspmatrix_csr(dmat)
+        and dmat.shape == shape
+        and dmat.nnz == dmat.indptr[1]*shape[0]
+    )
+    if not c0:
+        msg = (
+            "Arg dmat must be a csr_matrix from get_design_matrix()!\n"
+            f"\t- expected shape: {shape}\n"
+            f"\t- provided: {dmat!r}"
+        )
+        raise Exception(msg)
+
+
 def _get_bs2d_func_check(
-    coefs=None,
     ii=None,
     jj=None,
     indbs=None,
@@ -373,36 +667,18 @@ def _get_bs2d_func_check(
             )
             raise Exception(msg)
 
-    # R, Z
-    if not isinstance(R, np.ndarray):
+    # R, Z: no copy nor new view if already np.ndarray of ndim >= 1
+    if type(R) is not np.ndarray or R.ndim == 0:
         R = np.atleast_1d(R)
-    if not isinstance(Z, np.ndarray):
+    if type(Z) is not np.ndarray or Z.ndim == 0:
         Z = np.atleast_1d(Z)
-    assert R.shape == Z.shape
-
-    # coefs
-    if coefs is None:
-        coefs = 1.
-    if np.isscalar(coefs):
-        pass
-    else:
-        coefs = np.atleast_1d(coefs)
-        if coefs.ndim < len(shapebs) or coefs.ndim > len(shapebs) + 1:
-            msg = (
-                "coefs has too small / big shape!\n"
-                f"\t- coefs.shape: {coefs.shape}\n"
-                f"\t- shapebs:     {shapebs}"
-            )
-            raise Exception(msg)
-        if coefs.ndim == len(shapebs):
-            coefs = coefs.reshape(tuple(np.r_[1, coefs.shape]))
-        if coefs.shape[1:] != shapebs:
-            msg = (
-                "coefs has wrong shape!\n"
-                f"\t- coefs.shape: {coefs.shape}\n"
-                f"\t- shapebs:     {shapebs}"
-            )
-            raise Exception(msg)
+    if R.shape != Z.shape:
+        msg = (
+            "Args R and Z must have the same shape!\n"
+            f"\t- R.shape: {R.shape}\n"
+            f"\t- Z.shape: {Z.shape}"
+        )
+        raise Exception(msg)
 
     # crop
     if crop is None:
@@ -415,7 +691,31 @@ def _get_bs2d_func_check(
         raise Exception(msg)
     crop = crop and cropbs is not None and cropbs is not False
 
-    return coefs, ii, jj, R, Z, crop
+    return ii, jj, R, Z, crop
+
+
+def _get_bs2d_func_ind_per_bs(size=None, deg=None, nkpbs=None):
+    """ Return the indices of the unique knots / cents
+
+    Return:
+        - ind_mult: (size + 2*deg,) indices with edge multiplicity deg+1
+        - ind_per_bs: (nkpbs, nbs) indices for each bspline
+    The last deg bsplines use negative indices (from the end)
+    """
+
+    ind_mult = np.r_[
+        np.zeros((deg,), dtype=int),
+        np.arange(0, size),
+        np.full((deg,), size - 1),
+    ]
+
+    nbs = ind_mult.size - nkpbs + 1
+    ind_per_bs = ind_mult[
+        np.arange(0, nkpbs)[:, None] + np.arange(0, nbs)[None, :]
+    ]
+    if deg > 0:
+        ind_per_bs[:, -deg:] -= size
+    return ind_mult, ind_per_bs
 
 
 def _get_bs2d_func_knots(knots, deg=None, returnas=None, return_unique=None):
@@ -442,62 +742,13 @@ def _get_bs2d_func_knots(knots, deg=None, returnas=None, return_unique=None):
     size = knots.size
     nbs = size - 1 + deg
 
+    ind_mult, ind_per_bs = _get_bs2d_func_ind_per_bs(
+        size=size, deg=deg, nkpbs=nkpbs,
+    )
     if return_unique:
-        if deg == 0:
-            knots_per_bs = np.arange(0, size)
-        elif deg == 1:
-            knots_per_bs = np.r_[0, np.arange(0, size), size-1]
-        elif deg == 2:
-            knots_per_bs = np.r_[0, 0, np.arange(0, size), size-1, size-1]
-        elif deg == 3:
-            knots_per_bs = np.r_[
-                0, 0, 0, np.arange(0, size), size-1, size-1, size-1,
-            ]
-
+        knots_per_bs = ind_mult
     else:
-        knots_per_bs = np.zeros((nkpbs, nbs), dtype=int)
-
-        if deg == 0:
-            knots_per_bs[:, :] = np.array([
-                np.arange(0, size-1),
-                np.arange(1, size),
-            ])
-
-        elif deg == 1:
-            knots_per_bs[:, 1:-1] = np.array([
-                np.arange(0, size-2),
-                np.arange(1, size-1),
-                np.arange(2, size),
-            ])
-            knots_per_bs[:, 0] = [0, 0, 1]
-            knots_per_bs[:, -1] = [-2, -1, -1]
-
-        elif deg == 2:
-            knots_per_bs[:, 2:-2] = np.array([
-                np.arange(0, size-3),
-                np.arange(1, size-2),
-                np.arange(2, size-1),
-                np.arange(3, size),
-            ])
-            knots_per_bs[:, 0] = [0, 0, 0, 1]
-            knots_per_bs[:, 1] = [0, 0, 1, 2]
-            knots_per_bs[:, -2] = [-3, -2, -1, -1]
-            knots_per_bs[:, -1] = [-2, -1, -1, -1]
-
-        elif deg == 3:
-            knots_per_bs[:, 3:-3] = np.array([
-                np.arange(0, size-4),
-                np.arange(1, size-3),
-                np.arange(2, size-2),
-                np.arange(3, size-1),
-                np.arange(4, size),
-            ])
-            knots_per_bs[:, 0] = [0, 0, 0, 0, 1]
-            knots_per_bs[:, 1] = [0, 0, 0, 1, 2]
-            knots_per_bs[:, 2] = [0, 0, 1, 2, 3]
-            knots_per_bs[:, -3] = [-4, -3, -2, -1, -1]
-            knots_per_bs[:, -2] = [-3, -2, -1, -1, -1]
-            knots_per_bs[:, -1] = [-2, -1, -1, -1, -1]
+        knots_per_bs = ind_per_bs
 
     # ----------
     # return
@@ -520,46 +771,9 @@ def _get_bs2d_func_cents(cents, deg=None, returnas=None):
         allowed=['ind', 'data'],
     )
 
-    nkpbs = 1 + deg
-    size = cents.size
-    nbs = size + deg
-    cents_per_bs = np.zeros((nkpbs, nbs), dtype=int)
-
-    if deg == 0:
-        cents_per_bs[0, :] = np.arange(0, size)
-
-    elif deg == 1:
-        cents_per_bs[:, 1:-1] = np.array([
-            np.arange(0, size-1),
-            np.arange(1, size),
-        ])
-        cents_per_bs[:, 0] = [0, 0]
-        cents_per_bs[:, -1] = [-1, -1]
-
-    elif deg == 2:
-        cents_per_bs[:, 2:-2] = np.array([
-            np.arange(0, size-2),
-            np.arange(1, size-1),
-            np.arange(2, size),
-        ])
-        cents_per_bs[:, 0] = [0, 0, 0]
-        cents_per_bs[:, 1] = [0, 0, 1]
-        cents_per_bs[:, -2] = [-2, -1, -1]
-        cents_per_bs[:, -1] = [-1, -1, -1]
-
-    elif deg == 3:
-        cents_per_bs[:, 3:-3] = np.array([
-            np.arange(0, size-3),
-            np.arange(1, size-2),
-            np.arange(2, size-1),
-            np.arange(3, size),
-        ])
-        cents_per_bs[:, 0] = [0, 0, 0, 0]
-        cents_per_bs[:, 1] = [0, 0, 0, 1]
-        cents_per_bs[:, 2] = [0, 0, 1, 2]
-        cents_per_bs[:, -3] = [-3, -2, -1, -1]
-        cents_per_bs[:, -2] = [-2, -1, -1, -1]
-        cents_per_bs[:, -1] = [-1, -1, -1, -1]
+    _, cents_per_bs = _get_bs2d_func_ind_per_bs(
+        size=cents.size, deg=deg, nkpbs=1 + deg,
+    )
 
     if returnas == 'data':
         cents_per_bs = cents[cents_per_bs]
@@ -575,8 +789,8 @@ def _get_bs2d_func_max(Rknots=None, Zknots=None, deg=None):
 
     if nbkbs % 2 == 0:
         ii = int(nbkbs/2)
-        Rbs_cent = np.mean(knots_per_bs_R[ii-1:ii+1, :], axis=0)
-        Zbs_cent = np.mean(knots_per_bs_Z[ii-1:ii+1, :], axis=0)
+        Rbs_cent = 0.5*(knots_per_bs_R[ii-1] + knots_per_bs_R[ii])
+        Zbs_cent = 0.5*(knots_per_bs_Z[ii-1] + knots_per_bs_Z[ii])
         if deg == 2:
             Rbs_cent[:deg] = [Rknots[0], 0.5*(Rknots[0] + Rknots[1])]
             Rbs_cent[-deg:] = [0.5*(Rknots[-2] + Rknots[-1]), Rknots[-1]]
@@ -634,47 +848,20 @@ def get_bs2d_func(
 ):
 
     # ----------------
-    # Pre-compute bsplines basis elements
-
-    lbr = [
-        scpinterp.BSpline.basis_element(
-            knots_per_bs_R[:, ii],
-            extrapolate=False,
-        )
-        for ii in range(shapebs[0])
-    ]
-    lbz = [
-        scpinterp.BSpline.basis_element(
-            knots_per_bs_Z[:, jj],
-            extrapolate=False,
-        )
-        for jj in range(shapebs[1])
-    ]
-
-    RectBiv = [[None for jj in range(shapebs[1])] for ii in range(shapebs[0])]
-    for ii in range(shapebs[0]):
-        for jj in range(shapebs[1]):
-            def func(rr, zz, coefs=None, br=lbr[ii], bz=lbz[jj]):
-                if hasattr(coefs, '__iter__'):
-                    if rr.ndim == 1:
-                        val = coefs[:, None] * (br(rr)*bz(zz))[None, ...]
-                    else:
-                        val = coefs[:, None, None] * (br(rr)*bz(zz))[None, ...]
-                else:
-                    val = coefs * br(rr)*bz(zz)
-                return val
-            RectBiv[ii][jj] = func
-
-    # ----------------
-    # Define functions
+    # Instanciate class
 
     RectBiv_scipy = BivariateSplineRect(
         knotsR=Rknots,
         knotsZ=Zknots,
         deg=deg,
         shapebs=shapebs,
+        knots_per_bs_x=knots_per_bs_R,
+        knots_per_bs_y=knots_per_bs_Z,
     )
 
+    # ----------------
+    # Define functions
+
     def RectBiv_details(
         R,
         Z,
@@ -685,11 +872,17 @@ def get_bs2d_func(
         cropbs=None,
         coefs=None,
         reshape=None,
+        returnas=None,
+        dmat=None,
     ):
-        """ Return the value for each point summed on all bsplines """
+        """ Return the value of each bspline for each point
+
+        Use returnas='sparse' to get a csr_matrix of the non-zero values
+        Use dmat to re-use a design matrix of the same points
+        """
 
         # check inputs
-        _, _, _, r, z, crop = _get_bs2d_func_check(
+        _, _, r, z, crop = _get_bs2d_func_check(
             R=R,
             Z=Z,
             shapebs=shapebs,
@@ -701,6 +894,8 @@ def get_bs2d_func(
             z,
             indbs_tuple_flat=indbs_tuple_flat,
             reshape=reshape,
+            returnas=returnas,
+            dmat=dmat,
         )
 
     def RectBiv_sum(
@@ -708,53 +903,45 @@ def get_bs2d_func(
         Z,
         coefs=None,
         shapebs=shapebs,
-        RectBiv=RectBiv,
         crop=None,
         cropbs=None,
         RectBiv_scipy=RectBiv_scipy,
         indbs_tuple_flat=None,
         reshape=None,
+        out=None,
+        dmat=None,
     ):
-        """ Return the value for each point summed on all bsplines """
+        """ Return the value for each point summed on all bsplines
+
+        Use out to provide a pre-allocated (nt, R.shape) result buffer
+        Use dmat to re-use a design matrix of the same points
+        """
 
         # check inputs
-        coefs, _, _, r, z, crop = _get_bs2d_func_check(
-            coefs=coefs,
+        _, _, r, z, crop = _get_bs2d_func_check(
             R=R,
             Z=Z,
             shapebs=shapebs,
             crop=crop,
             cropbs=cropbs,
         )
+        coefs = _ev_check_coefs(coefs=coefs, shapebs=shapebs)
 
-        # prepare
-        nt = 1 if np.isscalar(coefs) else coefs.shape[0]
-        shapepts = r.shape
-
-        shape = tuple(np.r_[nt, shapepts])
-        val = np.zeros(shape, dtype=float)
-        cropbs_neg_flat = ~cropbs.ravel() if crop else None
+        # cropped bsplines, None if none is actually cropped (no coefs copy)
+        cropbs_neg = None
+        if crop:
+            cropbs_neg = ~cropbs
+            if not np.any(cropbs_neg):
+                cropbs_neg = None
 
         # compute
-        if np.isscalar(coefs):
-            val[0, ...] = RectBiv_scipy(
-                r,
-                z,
-                grid=False,
-                coefs=coefs,
-                cropbs_neg_flat=cropbs_neg_flat,
-            )
-
-        else:
-            for ii in range(coefs.shape[0]):
-                val[ii, ...] = RectBiv_scipy(
-                    r,
-                    z,
-                    grid=False,
-                    coefs=coefs[ii, ...],
-                    cropbs_neg_flat=cropbs_neg_flat,
-                )
-
-        return val
+        return RectBiv_scipy.ev_sum(
+            r,
+            z,
+            coefs=coefs,
+            cropbs_neg=cropbs_neg,
+            out=out,
+            dmat=dmat,
+        )
 
     return RectBiv_details, RectBiv_sum, RectBiv_scipy
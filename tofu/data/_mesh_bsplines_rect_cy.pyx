@@ -0,0 +1,109 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: initializedcheck=False
+# cython: cdivision=True
+#
+# Compiled kernels for rectangular bsplines
+# Used by _mesh_bsplines_rect when numba is not available
+#
+from cython.parallel import prange
+from libc.math cimport NAN
+
+
+# max number of non-zero bsplines per point and direction (deg <= 3)
+cdef enum:
+    _NNMAX = 4
+
+
+cdef inline long _get_span(double x, double[::1] knots) nogil:
+    # bisection for the span of x, right edge included
+    cdef long lo = 0
+    cdef long hi = knots.shape[0] - 1
+    cdef long mid
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if knots[mid] <= x:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+cdef inline long _bs1d_nonzero(double x,
+                               double[::1] knots,
+                               double[:, :, ::1] poly,
+                               double* val) nogil:
+    # Horner evaluation of the deg+1 non-zero bsplines, returns the span
+    cdef int nn = poly.shape[1]
+    cdef int jj, kk
+    cdef long ispan = _get_span(x, knots)
+    cdef double uu = (x - knots[ispan]) / (knots[ispan + 1] - knots[ispan])
+    for jj in range(nn):
+        val[jj] = poly[ispan, jj, nn - 1]
+        for kk in range(nn - 2, -1, -1):
+            val[jj] = val[jj] * uu + poly[ispan, jj, kk]
+    return ispan
+
+
+cdef inline void _eval_sum_point(double R,
+                                 double Z,
+                                 double[::1] knotsR,
+                                 double[::1] knotsZ,
+                                 double[:, :, ::1] polyR,
+                                 double[:, :, ::1] polyZ,
+                                 double[:, :, ::1] coefs,
+                                 double[:, ::1] out,
+                                 long pp) nogil:
+    # local arrays => private to each thread
+    cdef int nn = polyR.shape[1]
+    cdef long tt, iR, iZ
+    cdef int aa, bb
+    cdef double tot
+    cdef double valR[_NNMAX]
+    cdef double valZ[_NNMAX]
+
+    # non-zero 1d bsplines
+    iR = _bs1d_nonzero(R, knotsR, polyR, valR)
+    iZ = _bs1d_nonzero(Z, knotsZ, polyZ, valZ)
+
+    # accumulate
+    for tt in range(coefs.shape[0]):
+        tot = 0.
+        for aa in range(nn):
+            for bb in range(nn):
+                tot += coefs[tt, iR + aa, iZ + bb] * valR[aa] * valZ[bb]
+        out[tt, pp] = tot
+
+
+def eval_sum(double[::1] R,
+             double[::1] Z,
+             double[::1] knotsR,
+             double[::1] knotsZ,
+             double[:, :, ::1] polyR,
+             double[:, :, ::1] polyZ,
+             double[:, :, ::1] coefs,
+             double[:, ::1] out):
+    """ Sum of all bsplines at each point (R, Z), for each time step
+
+    Same arguments as the numba kernel of _mesh_bsplines_rect_nb:
+        - coefs is a (nt, nbsR, nbsZ) array, cropped bsplines set to 0
+        - out is a (nt, npts) array, set to nan outside of the mesh
+    """
+
+    cdef long nt = coefs.shape[0]
+    cdef long nkR = knotsR.shape[0]
+    cdef long nkZ = knotsZ.shape[0]
+    cdef long pp, tt
+
+    for pp in prange(R.shape[0], nogil=True):
+        if (
+            R[pp] < knotsR[0] or R[pp] > knotsR[nkR - 1]
+            or Z[pp] < knotsZ[0] or Z[pp] > knotsZ[nkZ - 1]
+        ):
+            for tt in range(nt):
+                out[tt, pp] = NAN
+        else:
+            _eval_sum_point(
+                R[pp], Z[pp], knotsR, knotsZ, polyR, polyZ, coefs, out, pp,
+            )
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+""" Optional numba kernels for rectangular bsplines
+
+Imported by _mesh_bsplines_rect on first use, only if numba is available
+"""
+
+
+# Common
+import numpy as np
+import numba as nb
+
+
+# kernels already compiled, per degree
+_DKERNELS = {}
+
+
+# #############################################################################
+# #############################################################################
+#                       Mesh2DRect - bsplines - kernels
+# #############################################################################
+
+
+def get_eval_sum(deg=None):
+    """ Return the eval_sum kernel specialized for deg
+
+    deg is a compile-time constant of the kernel, so all loops on the
+    deg+1 non-zero bsplines have a fixed length and can be unrolled
+    Each kernel is compiled on first use, and cached on disk (cache=True)
+    so that later processes do not compile it again
+    """
+    if deg not in _DKERNELS.keys():
+        _DKERNELS[deg] = _make_eval_sum(deg)
+    return _DKERNELS[deg]
+
+
+@nb.njit(cache=True)
+def _bs1d_nonzero(x, knots, poly, val, deg):
+    """ Horner evaluation of the non-zero bsplines for a single point
+
+    Fills val with bsplines ispan to ispan+deg and returns ispan
+    Called by eval_sum with deg a constant of its closure
+    """
+
+    # span, right edge included
+    ispan = np.searchsorted(knots, x, 'right') - 1
+    ispan = min(max(ispan, 0), knots.size - 2)
+
+    uu = (x - knots[ispan]) / (knots[ispan + 1] - knots[ispan])
+    for jj in range(deg + 1):
+        val[jj] = poly[ispan, jj, deg]
+        for kk in range(deg - 1, -1, -1):
+            val[jj] = val[jj] * uu + poly[ispan, jj, kk]
+    return ispan
+
+
+def _make_eval_sum(deg):
+
+    # the closure only holds ints, so that the on-disk cache of each
+    # degree is found again by later processes
+    nn = deg + 1
+
+    @nb.njit(parallel=True, cache=True)
+    def eval_sum(R, Z, knotsR, knotsZ, polyR, polyZ, coefs, out):
+        """ Sum of all bsplines at each point (R, Z), for each time step
+
+        R, Z are flat arrays of points
+        knotsR, knotsZ are the unique knots, polyR, polyZ their polynomials
+        coefs is a (nt, nbsR, nbsZ) array, cropped bsplines set to 0
+        out is a (nt, npts) array, set to nan outside of the mesh
+        """
+
+        nt = coefs.shape[0]
+
+        for pp in nb.prange(R.size):
+
+            # outside
+            c0 = (
+                R[pp] < knotsR[0] or R[pp] > knotsR[-1]
+                or Z[pp] < knotsZ[0] or Z[pp] > knotsZ[-1]
+            )
+            if c0:
+                out[:, pp] = np.nan
+                continue
+
+            # non-zero 1d bsplines
+            valR = np.empty((nn,))
+            valZ = np.empty((nn,))
+            iR = _bs1d_nonzero(R[pp], knotsR, polyR, valR, deg)
+            iZ = _bs1d_nonzero(Z[pp], knotsZ, polyZ, valZ, deg)
+
+            # accumulate
+            # for a given tt, the (deg+1) coefs along Z are contiguous and
+            # the deg+1 rows along R are nbsZ apart, i.e. a few cache lines
+            # => no need for a tiled (duplicated) copy of coefs
+            for tt in range(nt):
+                tot = 0.
+                for aa in range(nn):
+                    for bb in range(nn):
+                        tot += (
+                            coefs[tt, iR + aa, iZ + bb] * valR[aa] * valZ[bb]
+                        )
+                out[tt, pp] = tot
+
+    return eval_sum
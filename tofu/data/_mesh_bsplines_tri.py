@@ -665,12 +665,18 @@ def _get_bs2d_func_check(
             )
             raise Exception(msg)
 
-    # R, Z
-    if not isinstance(R, np.ndarray):
+    # R, Z: no copy nor new view if already np.ndarray of ndim >= 1
+    if type(R) is not np.ndarray or R.ndim == 0:
         R = np.atleast_1d(R)
-    if not isinstance(Z, np.ndarray):
+    if type(Z) is not np.ndarray or Z.ndim == 0:
         Z = np.atleast_1d(Z)
-    assert R.shape == Z.shape
+    if R.shape != Z.shape:
+        msg = (
+            "Args R and Z must have the same shape!\n"
+            f"\t- R.shape: {R.shape}\n"
+            f"\t- Z.shape: {Z.shape}"
+        )
+        raise Exception(msg)
 
     # crop
     crop = _generic_check._check_var(
@@ -840,8 +846,8 @@ def _get_bs2d_func_max(Rknots=None, Zknots=None, deg=None):
 
     if nbkbs % 2 == 0:
         ii = int(nbkbs/2)
-        Rbs_cent = np.mean(knots_per_bs_R[ii-1:ii+1, :], axis=0)
-        Zbs_cent = np.mean(knots_per_bs_Z[ii-1:ii+1, :], axis=0)
+        Rbs_cent = 0.5*(knots_per_bs_R[ii-1] + knots_per_bs_R[ii])
+        Zbs_cent = 0.5*(knots_per_bs_Z[ii-1] + knots_per_bs_Z[ii])
         if deg == 2:
             Rbs_cent[:deg] = [Rknots[0], 0.5*(Rknots[0] + Rknots[1])]
             Rbs_cent[-deg:] = [0.5*(Rknots[-2] + Rknots[-1]), Rknots[-1]]
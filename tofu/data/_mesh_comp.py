@@ -1128,14 +1128,13 @@ def _get_cropbs_from_crop(coll=None, crop=None, keybs=None):
         Zcents=coll.ddata[kZc]['data'],
     )
 
-    shapebs = coll.dobj['bsplines'][keybs]['shape']
-    cropbs = np.array([
-        [
-            np.all(crop[cents_per_bs_R[:, ii], cents_per_bs_Z[:, jj]])
-            for jj in range(shapebs[1])
-        ]
-        for ii in range(shapebs[0])
-    ], dtype=bool)
+    # a bspline is kept if its diagonal mesh elements are all kept, i.e.
+    # the elements (R cent k, Z cent k) for each rank k of its cents
+    # (ncents_per_bs, nbsR, nbsZ) => single vectorized pass on all bsplines
+    cropbs = np.all(
+        crop[cents_per_bs_R[:, :, None], cents_per_bs_Z[:, None, :]],
+        axis=0,
+    )
 
     return cropbs
 
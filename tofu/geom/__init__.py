@@ -9,10 +9,41 @@ Provides classes to model the 3D geometry of:
 * apertures and detectors
 """
 
+import sys
+import importlib
+
 from tofu.geom._core import PlasmaDomain, Ves, PFC, CoilPF, CoilCS, Config
 from tofu.geom._core import Rays, CamLOS1D, CamLOS2D
-from tofu.geom._core_optics import *
 import tofu.geom._comp_solidangles
 from . import utils
 
 __all__ = ['_GG', '_comp', '_plot', '_def', 'utils']
+
+
+# optics classes and submodules only imported on first access
+# {name: submodule it is taken from, None for the submodule itself}
+_DLAZY = {
+    'CrystalBragg': '_core_optics',
+    '_core_optics': None,
+    '_check_optics': None,
+    '_comp_optics': None,
+    '_plot_optics': None,
+}
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _DLAZY.keys():
+            msg = f"module {__name__!r} has no attribute {name!r}"
+            raise AttributeError(msg)
+        if _DLAZY[name] is None:
+            return importlib.import_module(f'{__name__}.{name}')
+        mod = importlib.import_module(f'{__name__}.{_DLAZY[name]}')
+        return getattr(mod, name)
+
+    def __dir__():
+        return sorted(list(globals().keys()) + list(_DLAZY.keys()))
+
+else:
+    # no module-level __getattr__ (PEP 562) before python 3.7
+    from tofu.geom._core_optics import CrystalBragg
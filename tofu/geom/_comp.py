@@ -4,7 +4,10 @@ This module is the computational part of the geometrical module of ToFu
 
 # Built-in
 import os
+import math
+import collections
 import warnings
+import weakref
 from xml.dom import minidom
 
 # Common
@@ -25,7 +28,16 @@ except Exception:
 
 
 _LTYPES = [int, float, np.int_, np.float_]
+_NUMERIC_TYPES = (int, float, np.integer, np.floating)
 _RES = 0.1
+_LOS_NPTS_BLOCK = 10000  # max nb. of pts per call to ff in LOS_calc_signal
+_INSIDECONVEXPOLY_NCACHE = 16  # max nb. of spline fits kept in cache
+_INSIDECONVEXPOLY_CACHE = collections.OrderedDict()
+
+
+def _is_numeric(val):
+    """ True if val is an int / float scalar (python or numpy), not a bool """
+    return isinstance(val, _NUMERIC_TYPES) and not isinstance(val, bool)
 
 
 ###############################################################################
@@ -328,9 +340,11 @@ def _Struct_set_Poly(
     """ Compute geometrical attributes of a Struct object """
 
     # Make Poly closed, counter-clockwise, with '(cc,N)' layout and arrayorder
+    formatted = False
     try:
         Poly = _GG.format_poly(Poly, order="C", Clock=False, close=True,
                                Test=True)
+        formatted = True
     except Exception as excp:
         print(excp)
     assert Poly.shape[0] == 2, "Arg Poly must be a 2D polygon !"
@@ -338,13 +352,13 @@ def _Struct_set_Poly(
 
     # Get all remarkable points and moments
     NP = Poly.shape[1] - 1
-    P1Max = Poly[:, np.argmax(Poly[0, :])]
-    P1Min = Poly[:, np.argmin(Poly[0, :])]
-    P2Max = Poly[:, np.argmax(Poly[1, :])]
-    P2Min = Poly[:, np.argmin(Poly[1, :])]
-    BaryP = np.sum(Poly[:, :-1], axis=1, keepdims=False) / (Poly.shape[1] - 1)
-    BaryL = np.array(
-        [(P1Max[0] + P1Min[0]) / 2.0, (P2Max[1] + P2Min[1]) / 2.0]
+    i1max, i1min = int(Poly[0, :].argmax()), int(Poly[0, :].argmin())
+    i2max, i2min = int(Poly[1, :].argmax()), int(Poly[1, :].argmin())
+    P1Max, P1Min = Poly[:, i1max], Poly[:, i1min]
+    P2Max, P2Min = Poly[:, i2max], Poly[:, i2min]
+    BaryP = Poly[:, :-1].mean(axis=1)
+    BaryL = 0.5 * np.array(
+        [Poly[0, i1max] + Poly[0, i1min], Poly[1, i2max] + Poly[1, i2min]]
     )
     BaryS, Surf = _GG.poly_area_and_barycenter(Poly, NP)
 
@@ -370,18 +384,27 @@ def _Struct_set_Poly(
     Vect = fPfmt(Vect)
 
     # Compute the normalised vectors directed inwards
-    Vin = np.array([Vect[1, :], -Vect[0, :]])
-    Vin = -Vin  # Poly is Counter Clock-wise as defined above
-    Vin = Vin / np.hypot(Vin[0, :], Vin[1, :])[np.newaxis, :]
-    Vin = fPfmt(Vin)
-
-    poly = _GG.format_poly(
-        Poly,
-        order=arrayorder,
-        Clock=Clock,
-        close=False,
-        Test=True,
-    )
+    # Poly is Counter Clock-wise as defined above => (-dy, dx)
+    Vin = np.empty(Vect.shape, dtype=float, order=arrayorder)
+    np.negative(Vect[1, :], out=Vin[0, :])
+    Vin[1, :] = Vect[0, :]
+    # sides have non-zero realistic lengths => no overflow / underflow risk
+    # (which np.hypot would guard against, at a higher cost)
+    norm = Vin[0, :] * Vin[0, :] + Vin[1, :] * Vin[1, :]
+    np.sqrt(norm, out=norm)
+    Vin /= norm[np.newaxis, :]
+
+    if formatted and arrayorder == "C" and Clock is False:
+        # Poly is already closed, counter-clockwise and C-contiguous
+        poly = np.ascontiguousarray(Poly[:, :-1])
+    else:
+        poly = _GG.format_poly(
+            Poly,
+            order=arrayorder,
+            Clock=Clock,
+            close=False,
+            Test=True,
+        )
 
     # Get bounding circle
     circC = BaryS
@@ -414,6 +437,48 @@ def _Struct_set_Poly(
     return dout
 
 
+def _Ves_get_InsideConvexPoly_spline(
+    Poly, BaryS, RelOff=_def.TorRelOff, Splprms=_def.TorSplprms,
+):
+    """ Return the knots (tckp) of the closed spline fit of Poly """
+    Np = Poly.shape[1]
+    Ptemp = (1.0 - RelOff) * (Poly - BaryS[:, None])
+    Ang = np.arctan2(Ptemp[1, :], Ptemp[0, :])
+    # sort + drop duplicates (1st occurrence kept, as np.unique would)
+    ind = np.argsort(Ang, kind="stable")
+    Ang = Ang[ind]
+    keep = np.empty(Ang.shape, dtype=bool)
+    keep[0] = True
+    np.not_equal(Ang[1:], Ang[:-1], out=keep[1:])
+    Ang, ind = Ang[keep], ind[keep]
+    Ptemp = Ptemp[:, ind]
+    # spline parameters
+    ww = Splprms[0] * np.ones((Np + 1,))
+    ss = Splprms[1] * (Np + 1)  # smoothness parameter
+    kk = Splprms[2]  # spline order
+    nest = int(
+        (Np + 1) / 2.0
+    )  # estimate of number of knots needed (-1 = maximal)
+    # closed x, y and angle, allocated once
+    xyang = np.empty((3, Ang.size + 1))
+    xyang[:2, :-1] = Ptemp
+    xyang[:2, -1] = Ptemp[:, 0]
+    xyang[2, :-1] = Ang
+    xyang[2, -1] = Ang[0] + 2.0 * np.pi
+
+    # Find the knot points
+    tckp, uu = scpinterp.splprep(
+        [xyang[0, :], xyang[1, :]],
+        u=xyang[2, :],
+        w=ww,
+        s=ss,
+        k=kk,
+        nest=nest,
+        full_output=0,
+    )
+    return tckp
+
+
 def _Ves_get_InsideConvexPoly(
     Poly,
     P2Min,
@@ -433,6 +498,7 @@ def _Ves_get_InsideConvexPoly(
             ZLim is None or ZLim == "Def" or type(ZLim) in [tuple, list]
         ), "Arg ZLim must be a tuple (ZlimMin, ZLimMax)"
         assert type(Spline) is bool, "Arg Spline must be a bool !"
+        assert BaryS.shape == (2,), "Arg BaryS must be a (2,) np.ndarray !"
     if ZLim is not None:
         if ZLim == "Def":
             ZLim = (
@@ -448,39 +514,22 @@ def _Ves_get_InsideConvexPoly(
         Poly = np.delete(Poly, indZLim.nonzero()[0], axis=1)
     if np.all(Poly[:, 0] == Poly[:, -1]):
         Poly = Poly[:, :-1]
-    Np = Poly.shape[1]
     if Spline:
-        BarySbis = np.tile(BaryS, (Np, 1)).T
-        Ptemp = (1.0 - RelOff) * (Poly - BarySbis)
-        # Poly = BarySbis + Ptemp
-        Ang = np.arctan2(Ptemp[1, :], Ptemp[0, :])
-        Ang, ind = np.unique(Ang, return_index=True)
-        Ptemp = Ptemp[:, ind]
-        # spline parameters
-        ww = Splprms[0] * np.ones((Np + 1,))
-        ss = Splprms[1] * (Np + 1)  # smoothness parameter
-        kk = Splprms[2]  # spline order
-        nest = int(
-            (Np + 1) / 2.0
-        )  # estimate of number of knots needed (-1 = maximal)
-        # Find the knot points
-
-        # TODO @DV : we can probably get rid of this
-        # tckp,uu = scpinterp.splprep([np.append(Ptemp[0,:],Ptemp[0,0]),
-        # np.append(Ptemp[1,:],Ptemp[1,0]),np.append(Ang,Ang[0]+2.*np.pi)],
-        # w=ww, s=ss, k=kk, nest=nest)
-        tckp, uu = scpinterp.splprep(
-            [
-                np.append(Ptemp[0, :], Ptemp[0, 0]),
-                np.append(Ptemp[1, :], Ptemp[1, 0]),
-            ],
-            u=np.append(Ang, Ang[0] + 2.0 * np.pi),
-            w=ww,
-            s=ss,
-            k=kk,
-            nest=nest,
-            full_output=0,
+        # the spline fit is cached (LRU) for identical polygon and parameters
+        key = (
+            Poly.shape, Poly.tobytes(), BaryS.tobytes(),
+            RelOff, tuple(Splprms),
         )
+        tckp = _INSIDECONVEXPOLY_CACHE.get(key)
+        if tckp is None:
+            tckp = _Ves_get_InsideConvexPoly_spline(
+                Poly, BaryS, RelOff=RelOff, Splprms=Splprms,
+            )
+            _INSIDECONVEXPOLY_CACHE[key] = tckp
+            if len(_INSIDECONVEXPOLY_CACHE) > _INSIDECONVEXPOLY_NCACHE:
+                _INSIDECONVEXPOLY_CACHE.popitem(last=False)
+        else:
+            _INSIDECONVEXPOLY_CACHE.move_to_end(key)
         xnew, ynew = scpinterp.splev(np.linspace(-np.pi, np.pi, NP), tckp)
         Poly = np.array([xnew + BaryS[0], ynew + BaryS[1]])
         Poly = np.concatenate((Poly, Poly[:, 0:1]), axis=1)
@@ -515,18 +564,17 @@ def _Ves_get_sample_checkinputs(
     dres = {'edge': 1, 'cross': 2, 'surface': 2, 'volume': 3}
     if res is None:
         res = _SAMPLE_RES[which]
-    ltypes = [int, float, np.int_, np.float_]
-    c0 = (type(res) in ltypes
+    c0 = (_is_numeric(res)
           or (hasattr(res, "__iter__")
               and len(res) == dres[which]
-              and all([type(ds) in ltypes for ds in res])))
+              and all(_is_numeric(ds) for ds in res)))
     if not c0:
         msg = ("Arg res must be either:\n"
                + "\t- float: unique resolution for all directions\n"
                + "\t- iterable of {} floats\n".format(dres[which])
                + "  You provided:\n{}".format(res))
         raise Exception(msg)
-    if type(res) in ltypes:
+    if _is_numeric(res):
         if which != 'edge':
             res = [float(res) for ii in range(dres[which])]
     else:
@@ -546,7 +594,7 @@ def _Ves_get_sample_checkinputs(
                    or (hasattr(dd, "__iter__")
                        and len(dd) == 2
                        and all([ss is None
-                                or type(ss) in ltypes
+                                or _is_numeric(ss)
                                 for ss in dd]))
                    for dd in domain]))
     if not c0:
@@ -597,6 +645,14 @@ def _Ves_get_sample_checkinputs(
     return res, domain, resMode, ind
 
 
+def _Ves_get_sample_isdisjoint(dd, MinMax):
+    """ Return True if sub-domain dd = [lower, upper] is outside MinMax """
+    return dd is not None and (
+        (dd[1] is not None and dd[1] < MinMax[0])
+        or (dd[0] is not None and dd[0] > MinMax[1])
+    )
+
+
 def _Ves_get_sampleEdge(
     VPoly,
     res=None,
@@ -620,8 +676,7 @@ def _Ves_get_sampleEdge(
     )
 
     # specific
-    ltypes = [int, float, np.int_, np.float_]
-    assert type(offsetIn) in ltypes
+    assert _is_numeric(offsetIn)
 
     # -------------
     #  Compute
@@ -759,6 +814,7 @@ def _Ves_get_sampleS(
                + "  You provided:\n{} ({})".format(nVLim, type(nVLim)))
         raise Exception(msg)
     VLim = None if (VLim is None or nVLim == 0) else np.array(VLim)
+    is_tor = VType.lower() == "tor"
 
     if not isinstance(Multi, bool):
         msg = ("Arg Multi must be a bool!\n"
@@ -798,7 +854,7 @@ def _Ves_get_sampleS(
             [0 for ii in Ind],
             [[0, 0] for ii in Ind],
         )
-        if VType.lower() == "tor":
+        if is_tor:
             for ii in range(0, len(Ind)):
                 if VLim[Ind[ii]] is None:
                     (pts[ii],
@@ -877,7 +933,7 @@ def _Ves_get_sampleS(
             [0 for ii in Ind],
             [[0, 0] for ii in Ind],
         )
-        if VType.lower() == "tor":
+        if is_tor:
             for ii in range(0, len(Ind)):
                 if ind[Ind[ii]].size > 0:
                     if VLim[Ind[ii]] is None:
@@ -965,11 +1021,28 @@ def _Ves_get_sampleV(
 
     MinMax1 = np.array([Min1, Max1])
     MinMax2 = np.array([Min2, Max2])
-    VLim = None if VType.lower() == "tor" else np.array(VLim).ravel()
+    is_tor = VType.lower() == "tor"
+    is_new = algo.lower() == "new"
+    VLim = None if is_tor else np.array(VLim).ravel()
     reseff = [None, None, None]
     if ind is None:
-        if VType.lower() == "tor":
-            if algo.lower() == "new":
+        if is_tor and is_new and (
+            _Ves_get_sample_isdisjoint(domain[0], MinMax1)
+            or _Ves_get_sample_isdisjoint(domain[1], MinMax2)
+        ):
+            # domain does not intersect the (R, Z) bounding box => no point
+            pts = np.empty((3, 0), dtype=float)
+            dV = np.empty((0,), dtype=float)
+            ind = np.empty((0,), dtype=int)
+            reseff = [
+                (MinMax1[1] - MinMax1[0])
+                / math.ceil((MinMax1[1] - MinMax1[0]) / res[0]),
+                (MinMax2[1] - MinMax2[0])
+                / math.ceil((MinMax2[1] - MinMax2[0]) / res[1]),
+                np.empty((0,), dtype=float),
+            ]
+        elif is_tor:
+            if is_new:
                 (pts, dV, ind,
                  reseff[0],
                  reseff[1],
@@ -1025,8 +1098,8 @@ def _Ves_get_sampleV(
                 margin=margin,
             )
     else:
-        if VType.lower() == "tor":
-            if algo.lower() == "new":
+        if is_tor:
+            if is_new:
                 (pts, dV,
                  reseff[0],
                  reseff[1],
@@ -1203,26 +1276,24 @@ def LOS_PRMin(Ds, us, kOut=None, Eps=1.0e-12, squeeze=True, Test=True):
             kOut = kOut[:, None]
     _, nlos, nref = Ds.shape
 
-    kRMin = np.full((nlos, nref), np.nan)
-    uparN = np.sqrt(us[0, :, :] ** 2 + us[1, :, :] ** 2)
-
-    # Case with u vertical
-    ind = uparN > Eps
-    kRMin[~ind] = 0.0
-
-    # Else
-    kRMin[ind] = (
-        -(us[0, ind] * Ds[0, ind] + us[1, ind] * Ds[1, ind]) / uparN[ind] ** 2
+    # Case with u vertical => 0, else minimum of R along the (infinite) LOS
+    uparN2 = us[0, :, :] ** 2 + us[1, :, :] ** 2
+    kRMin = np.zeros((nlos, nref))
+    np.divide(
+        -(us[0, :, :] * Ds[0, :, :] + us[1, :, :] * Ds[1, :, :]),
+        uparN2,
+        out=kRMin,
+        where=uparN2 > Eps**2,
     )
 
     # Check
     kRMin[kRMin <= 0.0] = 0.0
     if kOut is not None:
-        kRMin[kRMin > kOut] = kOut[kRMin > kOut]
+        np.copyto(kRMin, kOut, where=kRMin > kOut)
 
     # squeeze
     if squeeze:
-        if nref == 1 and nlos == 11:
+        if nref == 1 and nlos == 1:
             kRMin = kRMin[0, 0]
         elif nref == 1:
             kRMin = kRMin[:, 0]
@@ -1376,7 +1447,47 @@ def LOS_CrossProj(
 # ==============================================================================
 # =  Meshing & signal
 # ==============================================================================
-def LOS_get_sample(D, u, dL, DL=None, dLMode="abs", method="sum", Test=True):
+def _LOS_get_sample_check(D, u, dL, DL=None, dLMode="abs", method="sum"):
+    assert all(
+        [type(dd) is np.ndarray and dd.shape == (3,) for dd in [D, u]]
+    )
+    assert not hasattr(dL, "__iter__")
+    assert DL is not None and all(
+        [
+            hasattr(DL, "__iter__"),
+            len(DL) == 2,
+            all([not hasattr(dd, "__iter__") for dd in DL]),
+        ]
+    )
+    assert dLMode in ["abs", "rel"]
+    assert type(method) is str and method in [
+        "linspace",
+        "sum",
+        "simps",
+        "romb",
+    ]
+
+
+def _LOS_get_sample_N(dL, DL, dLMode="abs", method="sum"):
+    """ Return the number of intervals for the resolution and method """
+    # Compute the min number of intervals to satisfy the specified resolution
+    N = (
+        math.ceil((DL[1] - DL[0]) / dL)
+        if dLMode == "abs"
+        else math.ceil(1.0 / dL)
+    )
+    # Modify N according to the desired method
+    if method == "simps":
+        N = N if N % 2 == 0 else N + 1
+    elif method == "romb":
+        # next power of 2, in exact integer arithmetic
+        N = 2 ** (N - 1).bit_length()
+    return N
+
+
+def LOS_get_sample(
+    D, u, dL, DL=None, dLMode="abs", method="sum", Test=True, dtype=float
+):
     """ Return the sampled line, with the specified method
 
     'linspace': return the N+1 edges, including the first and last point
@@ -1385,88 +1496,135 @@ def LOS_get_sample(D, u, dL, DL=None, dLMode="abs", method="sum", Test=True):
              (scipy.simpson requires an even number of intervals)
     'romb' : return the N+1 edges, where N+1 = 2**k+1
              (fed to scipy.romb for integration)
+
+    Pts is returned with the specified dtype (default: float64)
+    np.float32 halves the memory footprint, at the cost of a relative
+    precision ~1e-7 on the point coordinates
     """
     if Test:
-        assert all(
-            [type(dd) is np.ndarray and dd.shape == (3,) for dd in [D, u]]
-        )
-        assert not hasattr(dL, "__iter__")
-        assert DL is None or all(
-            [
-                hasattr(DL, "__iter__"),
-                len(DL) == 2,
-                all([not hasattr(dd, "__iter__") for dd in DL]),
-            ]
-        )
-        assert dLMode in ["abs", "rel"]
-        assert type(method) is str and method in [
-            "linspace",
-            "sum",
-            "simps",
-            "romb",
-        ]
-    # Compute the min number of intervals to satisfy the specified resolution
-    N = (
-        int(np.ceil((DL[1] - DL[0]) / dL))
-        if dLMode == "abs"
-        else int(np.ceil(1.0 / dL))
-    )
-    # Modify N according to the desired method
-    if method == "simps":
-        N = N if N % 2 == 0 else N + 1
-    elif method == "romb":
-        N = 2 ** int(np.ceil(np.log(N) / np.log(2.0)))
+        _LOS_get_sample_check(D, u, dL, DL=DL, dLMode=dLMode, method=method)
+    N = _LOS_get_sample_N(dL, DL, dLMode=dLMode, method=method)
 
     # Derive k and dLr
     if method == "sum":
         dLr = (DL[1] - DL[0]) / N
-        k = DL[0] + (0.5 + np.arange(0, N)) * dLr
+        k = DL[0] + (0.5 + np.arange(N)) * dLr
     else:
         k, dLr = np.linspace(
             DL[0], DL[1], N + 1, endpoint=True, retstep=True, dtype=float
         )
 
-    Pts = D[:, np.newaxis] + k[np.newaxis, :] * u[:, np.newaxis]
+    if np.dtype(dtype) == np.float64:
+        Pts = D[:, np.newaxis] + k[np.newaxis, :] * u[:, np.newaxis]
+    else:
+        Pts = (
+            D.astype(dtype)[:, np.newaxis]
+            + k.astype(dtype)[np.newaxis, :] * u.astype(dtype)[:, np.newaxis]
+        )
     return Pts, k, dLr
 
 
-def LOS_calc_signal(
-    ff, D, u, dL, DL=None, dLMode="abs", method="romb", Test=True
+def LOS_get_sample_blocks(
+    D, u, dL, DL=None, dLMode="abs", block=None, Test=True, dtype=float
 ):
-    assert hasattr(ff, "__call__"), (
-        "Arg ff must be a callable (function) taking at least 1 positional ",
-        "Pts (a (3,N) np.ndarray of cartesian (X,Y,Z) coordinates) !",
-    )
-    assert not method == "linspace"
-    Pts, k, dLr = LOS_get_sample(
-        D, u, dL, DL=DL, dLMode=dLMode, method=method, Test=Test
-    )
-    out = insp(ff)
-    N = np.sum(
+    """ Yield the 'sum' sampling of the line by blocks of points
+
+    Yields (Pts, k, dLr) for consecutive blocks of at most block points
+    Pts is a view on a single pre-allocated (3, block) buffer, overwritten
+    at each iteration => it must be consumed before fetching the next block
+    Pts has the specified dtype (see LOS_get_sample())
+    """
+    if Test:
+        _LOS_get_sample_check(D, u, dL, DL=DL, dLMode=dLMode, method="sum")
+    if block is None:
+        block = _LOS_NPTS_BLOCK
+    N = _LOS_get_sample_N(dL, DL, dLMode=dLMode, method="sum")
+    dLr = (DL[1] - DL[0]) / N
+    buf = np.empty((3, min(block, N)), dtype=dtype)
+    for i0 in range(0, N, block):
+        k = DL[0] + (0.5 + np.arange(i0, min(i0 + block, N))) * dLr
+        Pts = buf[:, :k.size]
+        np.multiply.outer(u, k, out=Pts)
+        Pts += D[:, np.newaxis]
+        yield Pts, k, dLr
+
+
+# nb. of mandatory positional args of each ff, weak keys (ff is not kept)
+_LOS_CALC_SIGNAL_FF_NARGS = weakref.WeakKeyDictionary()
+
+
+def _LOS_calc_signal_ff_nargs(ff):
+    """ Return the nb. of mandatory positional args of ff
+
+    Cached per ff, since the same ff is typically used for all LOS
+    Callables that cannot be weakly referenced are inspected every time
+    """
+    try:
+        return _LOS_CALC_SIGNAL_FF_NARGS[ff]
+    except (KeyError, TypeError):
+        pass
+
+    nargs = int(np.sum(
         [
             (
                 pp.kind == pp.POSITIONAL_OR_KEYWORD
                 and pp.default is pp.empty
             )
-            for pp in out.parameters.values()
+            for pp in insp(ff).parameters.values()
         ]
+    ))
+    try:
+        _LOS_CALC_SIGNAL_FF_NARGS[ff] = nargs
+    except TypeError:
+        pass
+    return nargs
+
+
+def LOS_calc_signal(
+    ff, D, u, dL, DL=None, dLMode="abs", method="romb", Test=True,
+    dtype=float,
+):
+    assert hasattr(ff, "__call__"), (
+        "Arg ff must be a callable (function) taking at least 1 positional ",
+        "Pts (a (3,N) np.ndarray of cartesian (X,Y,Z) coordinates) !",
     )
+    assert not method == "linspace"
+    N = _LOS_calc_signal_ff_nargs(ff)
 
-    if N == 1:
-        Vals = ff(Pts)
-    elif N == 2:
-        Vals = ff(Pts, np.tile(-u, (Pts.shape[1], 1)).T)
-    else:
+    if N not in [1, 2]:
         raise ValueError(
             "The function (ff) assessing the emissivity locally "
             + "must take a single positional argument: Pts a (3,N)"
             + " np.ndarray of (X,Y,Z) cartesian coordinates !"
         )
 
-    Vals[np.isnan(Vals)] = 0.0
+    mu = -u.astype(dtype)[:, np.newaxis]
+
+    def _get_vals(Pts):
+        if N == 1:
+            return ff(Pts)
+        else:
+            # a fresh writable (3, N) array, ff may modify it
+            return ff(Pts, np.repeat(mu, Pts.shape[1], axis=1))
+
+    # 'sum': no need for all points at once => streamed by blocks of points
+    # so the full (3, npts) array of points is never allocated
     if method == "sum":
-        Int = np.sum(Vals) * dLr
-    elif method == "simps":
+        Int, dLr = 0., 0.
+        for Pts, k, dLr in LOS_get_sample_blocks(
+            D, u, dL, DL=DL, dLMode=dLMode, Test=Test, dtype=dtype,
+        ):
+            # accumulated in float64 whatever the dtype of Pts
+            Int += np.nansum(_get_vals(Pts), dtype=float)
+        return Int * dLr
+
+    Pts, k, dLr = LOS_get_sample(
+        D, u, dL, DL=DL, dLMode=dLMode, method=method, Test=Test,
+        dtype=dtype,
+    )
+    Vals = np.asarray(_get_vals(Pts), dtype=float)
+    Vals[np.isnan(Vals)] = 0.0
+    if method == "simps":
         Int = scpintg.simps(Vals, x=None, dx=dLr)
     elif method == "romb":
         Int = scpintg.romb(Vals, dx=dLr, show=False)
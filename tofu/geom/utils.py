@@ -4,6 +4,8 @@ import sys
 import os
 import warnings
 import inspect
+import math
+import functools
 
 # Third-party
 import numpy as np
@@ -25,6 +27,16 @@ _dict_lexcept_key = []
 
 _lok = np.arange(0,9)
 _lok = np.array([_lok, _lok+10])
+_LOK_SET = frozenset(_lok.ravel().tolist())
+# (indphi, indZ, sig) per cocos number: (R,phi,Z) if odd, (R,Z,phi) if even
+_COCOS_IND = dict([(int(cc), (1, 2, 1.) if (cc%10)%2==1 else (2, 1, -1.))
+                   for cc in _lok.ravel()])
+
+# read-only cartesian unit vectors, shared (never returned as is)
+_EX, _EY, _EZ = np.eye(3)
+for _ee in (_EX, _EY, _EZ):
+    _ee.setflags(write=False)
+del _ee
 
 _path_testcases = os.path.join(os.path.dirname(__file__), 'inputs')
 
@@ -51,7 +63,7 @@ class CoordinateInputError(Exception):
     msg += "The cocos (COordinates COnvetionS) are descibed in:\n"
     msg += "    [1] %s"%_cocosref
 
-    def __init__(self, msg, errors):
+    def __init__(self, msg, errors=None):
 
         # Call the base class constructor with the parameters it
         # needs
@@ -66,6 +78,12 @@ def _coords_checkformatcoords(coords='11'):
     if not type(coords) is str:
         msg = "Arg coords must be a str !"
         raise CoordinateInputError(msg)
+    return _coords_parse(coords)
+
+
+@functools.lru_cache(maxsize=64)
+def _coords_parse(coords):
+    """ Parse a coords str flag (cached, the set of flags is small) """
     coords = coords.lower()
 
     iint = np.array([ss.isdigit() for ss in coords]).nonzero()[0]
@@ -73,8 +91,8 @@ def _coords_checkformatcoords(coords='11'):
         coords = 'xyz'
     elif iint.size in [1,2]:
         coords = int(''.join([coords[jj] for jj in iint]))
-        if not coords in _lok.ravel():
-            msg = 'Not allowed number ({0) !'.format(coords)
+        if not coords in _LOK_SET:
+            msg = 'Not allowed number ({0}) !'.format(coords)
             raise CoordinateInputError(msg)
     else:
         msg = "Not allowed coords ({0}) !".format(coords)
@@ -82,47 +100,49 @@ def _coords_checkformatcoords(coords='11'):
     return coords
 
 
-def _coords_cocos2cart(pts, coords=11):
-    R = pts[0,:]
-    if (coords%0)%2==1:
-        indphi, indZi, sig = 1, 2, 1.
-    else:
-        indphi, indZ , sig= 2, 1, -1.
-    phi = sig*pts[indphi,:]
-
-    X = R*np.cos(phi)
-    Y = R*np.sin(phi)
-    Z = pts[indZ,:]
-    return np.array([X,Y,Z])
-
-def _coords_cart2cocos(pts, coords=11):
-    R = np.hypot(pts[0,:],pts[1,:])
-    phi = np.arctan2(pts[1,:],pts[0,:])
-    Z = pts[2,:]
-    if (coords%0)%2==1:
-        indphi, indZ, sig = 1, 2, 1.
-    else:
-        indphi, indZ , sig= 2, 1, -1.
-    pts_out = np.empty((3,pts.shape[1]),dtype=float)
-    pts_out[0,:] = R
-    pts_out[indphi,:] = sig*phi
-    pts_out[indZ,:] = Z
-    return pts_out
+def _coords_cocos2cart(pts, coords=11, out=None):
+    indphi, indZ, sig = _COCOS_IND[coords]
+    if out is None:
+        out = np.empty((3,pts.shape[1]), dtype=float)
+
+    # out (must not share memory with pts) is filled in place
+    # phi is stored in out[2,:] as scratch before Z
+    np.multiply(sig, pts[indphi,:], out=out[2,:])
+    np.cos(out[2,:], out=out[0,:])
+    np.sin(out[2,:], out=out[1,:])
+    out[2,:] = pts[indZ,:]
+    out[:2,:] *= pts[0:1,:]
+    return out
+
+def _coords_cart2cocos(pts, coords=11, out=None):
+    indphi, indZ, sig = _COCOS_IND[coords]
+    if out is None:
+        out = np.empty((3,pts.shape[1]), dtype=float)
+
+    # out (must not share memory with pts) is filled in place
+    np.hypot(pts[0,:], pts[1,:], out=out[0,:])
+    np.arctan2(pts[1,:], pts[0,:], out=out[indphi,:])
+    if sig<0.:
+        np.negative(out[indphi,:], out=out[indphi,:])
+    out[indZ,:] = pts[2,:]
+    return out
 
 def coords_transform(pts, coords_in='11', coords_out='11'):
 
+    # flags always checked (parsing is cached => cheap)
     coords_in = _coords_checkformatcoords(coords=coords_in)
     coords_out = _coords_checkformatcoords(coords=coords_out)
 
+    # identical flags => nothing to do
     if coords_in==coords_out:
-        pass
+        return pts
     elif coords_in=='xyz':
         pts = _coords_cart2cocos(pts, coords_out)
     elif coords_out=='xyz':
-        pts = _coords_cocos2cart(pts, coords_out)
-    else:
         pts = _coords_cocos2cart(pts, coords_in)
-        pts = _coords_cocos2cart(pts, coords_out)
+    else:
+        pts = _coords_cart2cocos(_coords_cocos2cart(pts, coords_in),
+                                 coords_out)
     return pts
 
 
@@ -133,10 +153,9 @@ def coords_transform(pts, coords_in='11', coords_out='11'):
 ###########################################################
 
 def get_nIne1e2(P, nIn=None, e1=None, e2=None):
-    assert np.hypot(P[0],P[1])>1.e-12
-    phi = np.arctan2(P[1],P[0])
-    ephi = np.array([-np.sin(phi), np.cos(phi), 0.])
-    ez = np.array([0.,0.,1.])
+    assert math.hypot(P[0],P[1])>1.e-12
+    phi = math.atan2(P[1],P[0])
+    ephi = np.array([-math.sin(phi), math.cos(phi), 0.])
 
     if nIn is None:
         nIn = -P
@@ -146,11 +165,11 @@ def get_nIne1e2(P, nIn=None, e1=None, e2=None):
         if np.abs(np.abs(nIn[2])-1.) < 1.e-12:
             e1 = ephi
         else:
-            e1 = np.cross(nIn,ez)
-        e1 = e1 if np.sum(e1*ephi) > 0. else -e1
+            e1 = np.cross(nIn,_EZ)
+        e1 = e1 if np.einsum('i,i->', e1, ephi) > 0. else -e1
     e1 = e1 / np.linalg.norm(e1)
 
-    if not np.abs(np.sum(nIn*e1))<1.e-12:
+    if not np.abs(np.einsum('i,i->', nIn, e1))<1.e-12:
         msg = "Identified local base does not seem valid!\n"
         msg += "nIn = %s\n"%str(nIn)
         msg += "e1 =  %s\n"%str(e1)
@@ -171,11 +190,17 @@ def get_X12fromflat(X12, x12u=None, nx12=None):
             tolmag = int(np.log10(tol))-1
             x1u = np.unique(np.round(X12[0,:], -tolmag))
             x2u = np.unique(np.round(X12[1,:], -tolmag))
-            indx1 = np.digitize(X12[0,:], 0.5*(x1u[1:]+x1u[:-1]))
-            indx2 = np.digitize(X12[1,:], 0.5*(x2u[1:]+x2u[:-1]))
-            indx1u, indx2u = np.unique(indx1), np.unique(indx2)
-            x1u = np.unique([np.mean(X12[0,indx1==ii]) for ii in indx1u])
-            x2u = np.unique([np.mean(X12[1,indx2==ii]) for ii in indx2u])
+            # sorted edges => searchsorted (side='right' <=> np.digitize)
+            indx1 = np.searchsorted(0.5*(x1u[1:]+x1u[:-1]), X12[0,:],
+                                    side='right')
+            indx2 = np.searchsorted(0.5*(x2u[1:]+x2u[:-1]), X12[1,:],
+                                    side='right')
+            # mean per bin, in a single pass (non-empty bins only)
+            c1, c2 = np.bincount(indx1), np.bincount(indx2)
+            s1 = np.bincount(indx1, weights=X12[0,:])
+            s2 = np.bincount(indx2, weights=X12[1,:])
+            x1u = np.unique(s1[c1>0]/c1[c1>0])
+            x2u = np.unique(s2[c2>0]/c2[c2>0])
     else:
         x1u, x2u = x12u
     if nx12 is None:
@@ -186,8 +211,10 @@ def get_X12fromflat(X12, x12u=None, nx12=None):
     Dx12 = (x1u[1]-x1u[0], x2u[1]-x2u[0])
     ind = np.zeros((nx1,nx2),dtype=int)
 
-    indr = np.array([np.digitize(X12[0,:], 0.5*(x1u[1:]+x1u[:-1])),
-                     np.digitize(X12[1,:], 0.5*(x2u[1:]+x2u[:-1]))])
+    indr = np.array([
+        np.searchsorted(0.5*(x1u[1:]+x1u[:-1]), X12[0,:], side='right'),
+        np.searchsorted(0.5*(x2u[1:]+x2u[:-1]), X12[1,:], side='right'),
+    ])
     ind[indr[0,:],indr[1,:]] = np.arange(0,X12.shape[1])
     return x1u, x2u, ind, Dx12
 
@@ -197,7 +224,13 @@ def get_X12fromflat(X12, x12u=None, nx12=None):
 ###########################################################
 
 
-def compute_RaysCones(Ds, us, angs=np.pi/90., nP=40):
+def compute_RaysCones(Ds, us, angs=np.pi/90., nP=40, copy=True):
+    """ Return nP rays on a cone of half-angle angs around each (Ds, us) ray
+
+    If copy is True, returns (3, nD*nP) arrays Db, ub (Db is writable)
+    If copy is False, returns (3, nD, nP) arrays, where Db is a read-only
+    broadcast view of Ds (stride 0 along the last axis, must not be written)
+    """
     # Check inputs
     Ddim, udim = Ds.ndim, us.ndim
     assert Ddim in [1,2]
@@ -211,22 +244,35 @@ def compute_RaysCones(Ds, us, angs=np.pi/90., nP=40):
         Ds = Ds.reshape((3,1))
     nD = Ds.shape[1]
 
-    # Compute
+    # Compute on a (3, nD, nP) grid, broadcasting us, e1, e2 (3, nD, 1)
+    # against phi (nP,) instead of repeating them nP times
     phi = np.linspace(0.,2.*np.pi, nP)
-    phi = np.tile(phi,nD)[np.newaxis,:]
     if udim==1:
-        us = us[:,np.newaxis]/np.linalg.norm(us)
-        us = us.repeat(nD,axis=1)
+        us = np.broadcast_to((us/np.linalg.norm(us))[:,np.newaxis], (3,nD))
+    else:
+        us = us/np.sqrt(np.einsum('ij,ij->j', us, us))[np.newaxis,:]
+    us = us[:,:,np.newaxis]
+    e1 = np.empty((3,nD,1))
+    e1[0,...] = us[1,...]
+    np.negative(us[0,...], out=e1[1,...])
+    e1[2,...] = 0.
+    e2 = np.empty((3,nD,1))
+    np.multiply(-us[2,...], e1[1,...], out=e2[0,...])
+    np.multiply(us[2,...], e1[0,...], out=e2[1,...])
+    e2[2,...] = us[0,...]*e1[1,...] - us[1,...]*e1[0,...]
+
+    # transcendentals tabulated once, on nP angles and the scalar angs
+    cp, sp = np.cos(phi), np.sin(phi)
+    ca, sa = np.cos(angs), np.sin(angs)
+    ub = np.empty((3,nD,nP))
+    np.multiply(cp, e1, out=ub)
+    ub += sp*e2
+    ub *= sa
+    ub += us*ca
+    if copy:
+        return Ds.repeat(nP,axis=1), ub.reshape((3,nD*nP))
     else:
-        us = us/np.sqrt(np.sum(us**2,axis=0))[np.newaxis,:]
-    us = us.repeat(nP, axis=1)
-    e1 = np.array([us[1,:],-us[0,:],np.zeros((us.shape[1],))])
-    e2 = np.array([-us[2,:]*e1[1,:], us[2,:]*e1[0,:],
-                   us[0,:]*e1[1,:]-us[1,:]*e1[0,:]])
-    ub = (us*np.cos(angs)
-          + (np.cos(phi)*e1+np.sin(phi)*e2)*np.sin(angs))
-    Db = Ds.repeat(nP,axis=1)
-    return Db, ub
+        return np.broadcast_to(Ds[:,:,np.newaxis], (3,nD,nP)), ub
 
 
 ###########################################################
@@ -235,6 +281,29 @@ def compute_RaysCones(Ds, us, angs=np.pi/90., nP=40):
 ###########################################################
 
 
+def _compute_VesPoly_deform(pts, cent, r, elong, Dshape=0.):
+    """ Return the (2,N) unit-centered pts, scaled and moved around cent
+
+    The radius is scaled by r and the elongation, and by the D-shape on the
+    inner side (Dshape>0.)
+    The cos / sin of the polar angle are computed once, in the output
+    """
+    theta = np.arctan2(pts[1,:], pts[0,:])
+    rbis = r*np.hypot(pts[0,:], pts[1,:])
+    rbis *= 1. + elong*0.15*np.sin(2.*theta-np.pi/2.)
+
+    out = np.empty((2, theta.size), dtype=float)
+    np.cos(theta, out=out[0,:])
+    np.sin(theta, out=out[1,:])
+    if Dshape>0.:
+        # masked multiply (inner side only), no gather / scatter
+        rbis *= 1. + Dshape*(out[1,:]**2-1.)*(out[0,:]<0.)
+
+    out *= rbis[np.newaxis,:]
+    out += cent[:,np.newaxis]
+    return out
+
+
 def _compute_VesPoly(R=None, r=None, elong=None, Dshape=None,
                      divlow=None, divup=None, nP=None):
     """ Utility to compute three 2D (R,Z) polygons
@@ -321,16 +390,7 @@ def _compute_VesPoly(R=None, r=None, elong=None, Dshape=None,
                               axis=1)
 
     # Modified radius (by elongation and Dshape)
-    rbis = r*np.hypot(poly[0,:],poly[1,:])
-    theta = np.arctan2(poly[1,:],poly[0,:])
-    rbis = rbis*(1+elong*0.15*np.sin(2.*theta-np.pi/2.))
-    if Dshape>0.:
-        ind = np.cos(theta)<0.
-        coef = 1 + Dshape*(np.sin(theta[ind])**2-1.)
-        rbis[ind] = rbis[ind]*coef
-
-    er = np.array([np.cos(theta), np.sin(theta)])
-    poly = cent[:,np.newaxis] + rbis[np.newaxis,:]*er
+    poly = _compute_VesPoly_deform(poly, cent, r, elong, Dshape=Dshape)
 
     # Outer bumper
     Dbeta = 2.*np.pi/6.
@@ -344,22 +404,14 @@ def _compute_VesPoly(R=None, r=None, elong=None, Dshape=None,
     pbump = (pbRin, pbRout[:,:ind[0]], pinsert,
              pbRout[:,ind[-1]+1:], pbRin[:,0:1])
     pbump = np.concatenate(pbump, axis=1)
-    theta = np.arctan2(pbump[1,:],pbump[0,:])
-    er = np.array([np.cos(theta), np.sin(theta)])
-    rbis = r*(np.hypot(pbump[0,:],pbump[1,:])
-              *(1.+elong*0.15*np.sin(2.*theta-np.pi/2.)))
-    pbump = cent[:,np.newaxis] + rbis[np.newaxis,:]*er
+    pbump = _compute_VesPoly_deform(pbump, cent, r, elong)
 
     # Baffle
     offR, offZ = 0.1, -0.85
     wR, wZ = 0.2, 0.05
     pbaffle = np.array([offR + wR*np.r_[-1,1,1,-1,-1],
                         offZ + wZ*np.r_[1,1,-1,-1,1]])
-    theta = np.arctan2(pbaffle[1,:],pbaffle[0,:])
-    er = np.array([np.cos(theta), np.sin(theta)])
-    rbis = r*(np.hypot(pbaffle[0,:],pbaffle[1,:])
-              *(1.+elong*0.15*np.sin(2.*theta-np.pi/2.)))
-    pbaffle = cent[:,np.newaxis] + rbis[np.newaxis,:]*er
+    pbaffle = _compute_VesPoly_deform(pbaffle, cent, r, elong)
 
     return poly, pbump, pbaffle
 
@@ -370,6 +422,32 @@ def _compute_VesPoly(R=None, r=None, elong=None, Dshape=None,
 ###########################################################
 
 
+def _get_unit_vectors(P, Ds):
+    """ Return the (3,N) unit vectors from each Ds towards the pinhole P
+
+    Computed in a single pre-allocated buffer (no full-size temporary)
+    us has the same dtype as Ds (float64 or float32)
+    """
+    us = np.empty(Ds.shape, dtype=Ds.dtype)
+    np.subtract(P[:,np.newaxis], Ds, out=us)
+    n2 = np.einsum('ij,ij->j', us, us)
+    np.sqrt(n2, out=n2)
+    us /= n2[np.newaxis,:]
+    return us
+
+
+def _normalize3(v):
+    """ Return the normalized (3,) vector v, without np.linalg overhead """
+    return v / math.sqrt(v[0]*v[0] + v[1]*v[1] + v[2]*v[2])
+
+
+def _cross3(a, b):
+    """ Return the cross product of (3,) vectors, without np.cross overhead """
+    return np.array([a[1]*b[2] - a[2]*b[1],
+                     a[2]*b[0] - a[0]*b[2],
+                     a[0]*b[1] - a[1]*b[0]])
+
+
 def _compute_PinholeCam_checkformatinputs(P=None, F=0.1, D12=None, N12=100,
                                           angs=0, nIn=None, VType='Tor', defRY=None, Lim=None):
     assert type(VType) is str
@@ -428,40 +506,38 @@ def _compute_PinholeCam_checkformatinputs(P=None, F=0.1, D12=None, N12=100,
         angs = np.arctan2(np.sin(angs),np.cos(angs))
 
     if VType=='tor':
-        R = np.hypot(P[0],P[1])
-        phi = np.arctan2(P[1],P[0])
-        eR = np.array([np.cos(phi), np.sin(phi), 0.])
-        ePhi = np.array([-np.sin(phi), np.cos(phi), 0.])
-        eZ = np.array([0.,0.,1.])
+        R = math.hypot(P[0],P[1])
+        phi = math.atan2(P[1],P[0])
+        eR = np.array([math.cos(phi), math.sin(phi), 0.])
+        ePhi = np.array([-math.sin(phi), math.cos(phi), 0.])
 
         if nIn is None:
-            nIncross = eR*np.cos(angs[0]) + eZ*np.sin(angs[0])
-            nIn = nIncross*np.cos(angs[1]) + ePhi*np.sin(angs[1])
-        nIn = nIn/np.linalg.norm(nIn)
+            nIncross = eR*math.cos(angs[0]) + _EZ*math.sin(angs[0])
+            nIn = nIncross*math.cos(angs[1]) + ePhi*math.sin(angs[1])
+        nIn = _normalize3(nIn)
 
 
         if np.abs(np.abs(nIn[2])-1.)<1.e-12:
             e10 = ePhi
         else:
-            e10 = np.cross(nIn,eZ)
-            e10 = e10/np.linalg.norm(e10)
+            e10 = _cross3(nIn,_EZ)
+            e10 = _normalize3(e10)
 
     else:
         X = P[0]
-        eX, eY, eZ = np.r_[1.,0.,0.], np.r_[0.,1.,0.], np.r_[0.,0.,1.]
         if nIn is None:
-            nIncross = eY*np.cos(angs[0]) + eY*np.sin(angs[0])
-            nIn = nIncross*np.cos(angs[1]) + eZ*np.sin(angs[1])
-        nIn = nIn/np.linalg.norm(nIn)
+            nIncross = _EY*math.cos(angs[0]) + _EY*math.sin(angs[0])
+            nIn = nIncross*math.cos(angs[1]) + _EZ*math.sin(angs[1])
+        nIn = _normalize3(nIn)
 
         if np.abs(np.abs(nIn[2])-1.)<1.e-12:
-            e10 = eX
+            e10 = _EX.copy()
         else:
-            e10 = np.cross(nIn,eZ)
-            e10 = e10/np.linalg.norm(e10)
+            e10 = _cross3(nIn,_EZ)
+            e10 = _normalize3(e10)
 
-    e20 = np.cross(e10,nIn)
-    e20 = e20/np.linalg.norm(e20)
+    e20 = _cross3(e10,nIn)
+    e20 = _normalize3(e20)
     if e20[2]<0.:
         e10, e20 = -e10, -e20
 
@@ -469,20 +545,54 @@ def _compute_PinholeCam_checkformatinputs(P=None, F=0.1, D12=None, N12=100,
         e1 = e10
         e2 = e20
     else:
-        e1 = np.cos(angs[2])*e10 + np.sin(angs[2])*e20
-        e2 = -np.sin(angs[2])*e10 + np.cos(angs[2])*e20
+        e1 = math.cos(angs[2])*e10 + math.sin(angs[2])*e20
+        e2 = -math.sin(angs[2])*e10 + math.cos(angs[2])*e20
 
     # Check consistency of vector base
-    assert all([np.abs(np.linalg.norm(ee)-1.)<1.e-12 for ee in [e1,nIn,e2]])
-    assert np.abs(np.sum(nIn*e1))<1.e-12
-    assert np.abs(np.sum(nIn*e2))<1.e-12
-    assert np.abs(np.sum(e1*e2))<1.e-12
-    assert np.linalg.norm(np.cross(e1,nIn)-e2)<1.e-12
+    assert all([np.abs(np.sqrt(ee.dot(ee))-1.)<1.e-12 for ee in [e1,nIn,e2]])
+    assert np.abs(np.einsum('i,i->', nIn, e1))<1.e-12
+    assert np.abs(np.einsum('i,i->', nIn, e2))<1.e-12
+    assert np.abs(np.einsum('i,i->', e1, e2))<1.e-12
+    dee = _cross3(e1,nIn) - e2
+    assert np.sqrt(dee.dot(dee))<1.e-12
 
     return P, F, D12, N12, angs, nIn, e1, e2, VType
 
 
 
+# memoized outputs of _compute_PinholeCam_checkformatinputs, so that
+# cameras built repeatedly from the same parameters (e.g.: the _dcam
+# cases) only compute their vector base once
+_PINHOLECAM_NCACHE = 32
+_PINHOLECAM_CACHE = {}
+
+
+def _get_PinholeCam_cached(**kwdargs):
+    """ Cached _compute_PinholeCam_checkformatinputs(), returns copies """
+    # type and shape in the key: inputs that would be rejected (e.g.: F=[0.1])
+    # must never hit the entry of an equivalent valid input (e.g.: F=0.1)
+    try:
+        key = tuple([
+            (k0, type(v0), v0)
+            if v0 is None or isinstance(v0, str)
+            else (k0, type(v0), np.shape(v0),
+                  tuple(np.asarray(v0, dtype=float).ravel().tolist()))
+            for k0, v0 in sorted(kwdargs.items())
+        ])
+    except (TypeError, ValueError):
+        return _compute_PinholeCam_checkformatinputs(**kwdargs)
+
+    out = _PINHOLECAM_CACHE.get(key)
+    if out is None:
+        out = _compute_PinholeCam_checkformatinputs(**kwdargs)
+        if len(_PINHOLECAM_CACHE) >= _PINHOLECAM_NCACHE:
+            _PINHOLECAM_CACHE.pop(next(iter(_PINHOLECAM_CACHE)))
+        _PINHOLECAM_CACHE[key] = out
+    return tuple([
+        oo.copy() if isinstance(oo, np.ndarray) else oo for oo in out
+    ])
+
+
 _comdoc = \
         """ Generate LOS for a {0}D camera
 
@@ -534,6 +644,12 @@ _comdoc = \
         Lim:    None / list / np.ndarray
             Only used if P is None and VTYpe is 'Lin'
             The vessel limits, by default P will be place in the middle
+        dtype:  None / np.dtype
+            dtype of the returned LOS arrays (Ds, and us if return_Du)
+            Use np.float32 to halve memory for large cameras
+            The vector base is always computed in float64 (default: float)
+            Only kept by the returned arrays: a tofu CamLOS object always
+            stores its LOS in float64
 
         Return
         ------
@@ -557,24 +673,23 @@ _comdoc = \
 def _compute_CamLOS1D_pinhole(P=None, F=0.1, D12=0.1, N12=100,
                               angs=[-np.pi,0.,0.], nIn=None,
                               VType='Tor', defRY=None, Lim=None,
-                              return_Du=False):
+                              return_Du=False, dtype=None):
 
     # Check/ format inputs
     P, F, D12, N12, angs, nIn, e1, e2, VType\
-            = _compute_PinholeCam_checkformatinputs(P=P, F=F, D12=D12, N12=N12,
-                                                    angs=angs, nIn=nIn,
-                                                    VType=VType, defRY=defRY,
-                                                    Lim=Lim)
+            = _get_PinholeCam_cached(P=P, F=F, D12=D12, N12=N12,
+                                     angs=angs, nIn=nIn,
+                                     VType=VType, defRY=defRY, Lim=Lim)
 
     # Get starting points
     d2 = 0.5*D12[1]*np.linspace(-1.,1.,N12[1],endpoint=True)
     d2e = d2[np.newaxis,:]*e2[:,np.newaxis]
 
     Ds = P[:,np.newaxis] - F*nIn[:,np.newaxis] + d2e
+    if dtype is not None:
+        Ds = Ds.astype(dtype, copy=False)
     if return_Du:
-        us = P[:,np.newaxis]-Ds
-        us = us / np.sqrt(np.sum(us**2,axis=0))[np.newaxis,:]
-        return Ds, us
+        return Ds, _get_unit_vectors(P, Ds)
     else:
         return Ds, P, d2
 
@@ -591,32 +706,31 @@ _compute_CamLOS1D_pinhole.__doc__ = _comdoc1
 def _compute_CamLOS2D_pinhole(P=None, F=0.1, D12=0.1, N12=100,
                               angs=[-np.pi,0.,0.], nIn=None,
                               VType='Tor', defRY=None, Lim=None,
-                              return_Du=False):
+                              return_Du=False, dtype=None):
 
     # Check/ format inputs
     P, F, D12, N12, angs, nIn, e1, e2, VType\
-            = _compute_PinholeCam_checkformatinputs(P=P, F=F, D12=D12, N12=N12,
-                                                    angs=angs, nIn=nIn,
-                                                    VType=VType, defRY=defRY,
-                                                    Lim=Lim)
+            = _get_PinholeCam_cached(P=P, F=F, D12=D12, N12=N12,
+                                     angs=angs, nIn=nIn,
+                                     VType=VType, defRY=defRY, Lim=Lim)
 
     # Get starting points
     d1 = 0.5*D12[0]*np.linspace(-1.,1.,N12[0],endpoint=True)
     d2 = 0.5*D12[1]*np.linspace(-1.,1.,N12[1],endpoint=True)
-    d1f = np.tile(d1,N12[1])
-    d2f = np.repeat(d2,N12[0])
-    d1e = d1f[np.newaxis,:]*e1[:,np.newaxis]
-    d2e = d2f[np.newaxis,:]*e2[:,np.newaxis]
 
     # Here compute ind12
     indflat2img = None
     indimg2flat = None
 
-    Ds = P[:,np.newaxis] - F*nIn[:,np.newaxis] + d1e + d2e
+    # Assembled on a (3,N2,N1) grid, then flattened (d1 varies fastest)
+    Ds = np.empty((3,N12[1],N12[0]), dtype=float if dtype is None else dtype)
+    np.multiply(d2[np.newaxis,:,np.newaxis], e2[:,np.newaxis,np.newaxis],
+                out=Ds)
+    Ds += d1[np.newaxis,np.newaxis,:]*e1[:,np.newaxis,np.newaxis]
+    Ds += (P - F*nIn)[:,np.newaxis,np.newaxis]
+    Ds = Ds.reshape((3,N12[0]*N12[1]))
     if return_Du:
-        us = P[:,np.newaxis]-Ds
-        us = us / np.sqrt(np.sum(us**2,axis=0))[np.newaxis,:]
-        return Ds, us
+        return Ds, _get_unit_vectors(P, Ds)
     else:
         return Ds, P, d1, d2, indflat2img, indimg2flat
 
@@ -821,7 +935,6 @@ def _create_config_testcase(
     # -------------------------
     # Get file and build config
 
-    lf = [f for f in os.listdir(path) if f[-4:]=='.txt']
     lS = []
     # include / exclude coils
     if coils is True:
@@ -833,14 +946,14 @@ def _create_config_testcase(
         ])
 
     Exp = dconfig[config]['Exp']
+    # files listed and filtered on Exp once, then only on (cc, ss)
+    lf = [f for f in os.listdir(path) if f[-4:] == '.txt' and Exp in f]
     dfail = {}
     for cc in lcls:
+        lfc = [f for f in lf if cc in f]
         for ss in dconfig[config][cc]:
             k0 = '{}_{}'.format(cc, ss)
-            ff = [
-                f for f in lf
-                if all([s in f for s in [cc, Exp, ss]])
-            ]
+            ff = [f for f in lfc if ss in f]
             if len(ff) == 0:
                 msg = (
                     "No matching files in {} ".format(path)
@@ -869,7 +982,7 @@ def _create_config_testcase(
 
             pfe = os.path.join(path, ff[0])
             try:
-                obj = eval('_core.'+cc).from_txt(
+                obj = getattr(_core, cc).from_txt(
                     pfe, Name=ss, Type='Tor',
                     Exp=dconfig[config]['Exp'],
                     returnas=returnas,
@@ -1052,6 +1165,14 @@ _dcam = {'V1':       {'P':_P1, 'F':_F, 'D12':_D12, 'nIn':_nIn1, 'N12':[1,1]},
          'VA100000': {'P':_PA, 'F':_F, 'D12':_D12A,'nIn':_nInA,'N12':[500,200]},
          'VA1000000':{'P':_PA, 'F':_F,'D12':_D12A,'nIn':_nInA,'N12':[1600,625]},
          'testV': {'P':_P, 'F':_testF, 'D12':_D12, 'nIn':_nIn,'N12':[1600,625]}}
+# nIn normalized once, at import
+for _vv in _dcam.values():
+    _vv['nIn'] = np.asarray(_vv['nIn'], dtype=float)
+    _vv['nIn'] = _vv['nIn'] / np.linalg.norm(_vv['nIn'])
+del _vv
+
+
+_CAMLOS_CLS = {1: _core.CamLOS1D, 2: _core.CamLOS2D}
 
 
 _createCamstr = """
@@ -1131,6 +1252,51 @@ _createCamerr = """ Arg out, specifying the output, must be either:
         """
 
 
+def _create_CamLOS_as_dict(nD=None, Ds=None, pinhole=None, d1=None, d2=None,
+                           indflat2img=None, indimg2flat=None, **kwdargs):
+    dout = {'D': Ds, 'pinhole': pinhole}
+    if nD == 2:
+        dout.update({
+            'x1': d1, 'x2': d2,
+            'indflat2img': indflat2img, 'indimg2flat': indimg2flat,
+        })
+    return dout
+
+
+def _create_CamLOS_as_Du(Ds=None, pinhole=None, **kwdargs):
+    return Ds, _get_unit_vectors(pinhole, Ds)
+
+
+def _create_CamLOS_as_object(
+    nD=None, Ds=None, pinhole=None,
+    Name=None, Exp=None, Diag=None, method=None,
+    etendues=None, surfaces=None, dchans=None,
+    color=None, config=None, SavePath=None,
+    **kwdargs
+):
+    return _CAMLOS_CLS[nD](
+        Name=Name, Exp=Exp, Diag=Diag,
+        dgeom={'pinhole': pinhole, 'D': Ds}, method=method,
+        Etendues=etendues, Surfaces=surfaces, dchans=dchans,
+        color=color, config=config, SavePath=SavePath
+    )
+
+
+_CAMLOS_ND = frozenset((1, 2))
+
+# accepted values of returnas, normalized to the keys of _CAMLOS_RETURNAS
+_CAMLOS_RETURNAS_KEY = {
+    object: 'object', 'object': 'object',
+    dict: 'dict', 'dict': 'dict',
+    'Du': 'Du',
+}
+_CAMLOS_RETURNAS = {
+    'object': _create_CamLOS_as_object,
+    'dict': _create_CamLOS_as_dict,
+    'Du': _create_CamLOS_as_Du,
+}
+
+
 def _create_CamLOS_check_inputs(
     case=None,
     pinhole=None,
@@ -1152,15 +1318,17 @@ def _create_CamLOS_check_inputs(
     nD=None,
     nIn=None,
     VType='Tor',
+    dcam=None,
     defRY=None,
     Lim=None,
     returnas=object,
+    dtype=None,
 ):
 
     # D
     if nD is None:
         nD = 1
-    if nD not in [1, 2]:
+    if nD not in _CAMLOS_ND:
         msg = (
             """
             Arg nD must be 1 or 2
@@ -1177,9 +1345,11 @@ def _create_CamLOS_check_inputs(
         lS = config.lStructIn
         if len(lS) == 0:
             lS = config.lStruct
-        defRY = np.max([ss.dgeom['P1Max'][0] for ss in lS])
+        defRY = max(ss.dgeom['P1Max'][0] for ss in lS)
 
     # Get parameters for test case if any
+    if dcam is None:
+        dcam = _dcam
     if case is not None and nD == 2:
         if case not in dcam.keys():
             msg = (
@@ -1196,12 +1366,11 @@ def _create_CamLOS_check_inputs(
 
         # Extract pinhole, focal length, width, nb. of pix., unit vector
         pinhole, focal = dcam[case]['P'], dcam[case]['F']
-        size, npixels = dcam[case]['D12'], dcam[case]['N12']
+        sensor_size, sensor_nb = dcam[case]['D12'], dcam[case]['N12']
         nIn = dcam[case]['nIn']
-        nIn = nIn / np.linalg.norm(nIn)
 
         # Compute the LOS starting points and unit vectors
-        nD, VType, Lim, angles = 2, 'Tor', None, None
+        nD, VType, Lim, orientation = 2, 'Tor', None, None
         Name = case
 
     # Deprecated args
@@ -1242,20 +1411,37 @@ def _create_CamLOS_check_inputs(
         orientation = dprecate['orientation'][0]
 
     # returnas
-    c0 = returnas in ['Du', dict, object]
+    try:
+        c0 = returnas in _CAMLOS_RETURNAS_KEY
+    except TypeError:
+        c0 = False
     if not c0:
         msg = (
             """
             Arg returnas must be:
                 - 'Du': return tuple (D, us)
-                - dict: return a dict
-                - object: return a tofu instance
+                - dict / 'dict': return a dict
+                - object / 'object': return a tofu instance
             You provided:
                 {}
             """.format(returnas)
         )
         raise Exception(msg)
 
+    # dtype: only kept by the arrays returned as 'Du' / dict
+    c0 = (
+        dtype is not None
+        and np.dtype(dtype) != np.float64
+        and _CAMLOS_RETURNAS_KEY[returnas] == 'object'
+    )
+    if c0:
+        msg = (
+            "Arg dtype ({}) is ignored for returnas=object:\n".format(dtype)
+            + "\ttofu CamLOS objects always store their LOS in float64\n"
+            + "\tUse returnas='Du' or dict to get arrays of the desired dtype"
+        )
+        warnings.warn(msg)
+
     # Return
     out = [
         nD, Lim, VType, defRY,
@@ -1297,6 +1483,7 @@ def _create_CamLOS(
     Lim=None,
     returnas=object,
     SavePath='./',
+    dtype=None,
 ):
     # -------------
     # Check inputs
@@ -1318,58 +1505,48 @@ def _create_CamLOS(
         nD=nD,
         nIn=nIn,
         VType=VType,
+        dcam=dcam,
         defRY=defRY,
         Lim=Lim,
         returnas=returnas,
+        dtype=dtype,
     )
 
     # -------------
     # Create
     kwdargs = dict(
         P=pinhole, F=focal, D12=sensor_size, N12=sensor_nb, angs=orientation,
-        nIn=nIn, VType=VType, defRY=defRY, Lim=Lim,
+        nIn=nIn, VType=VType, defRY=defRY, Lim=Lim, dtype=dtype,
     )
     if nD == 1:
         Ds, pinhole, d2 = _compute_CamLOS1D_pinhole(**kwdargs)
+        d1, indflat2img, indimg2flat = None, None, None
     else:
         (Ds, pinhole, d1, d2,
          indflat2img, indimg2flat) = _compute_CamLOS2D_pinhole(**kwdargs)
 
     # -------------
     # Return
-    if returnas is dict:
-        dout = {'D': Ds, 'pinhole': pinhole}
-        if nD == 2:
-            dout.update({
-                'x1': d1, 'x2': d2,
-                'indflat2img': indflat2img, 'indimg2flat': indimg2flat,
-            })
-        return dout
-
-    elif returnas == 'Du':
-        us = P[:, None] - Ds
-        us = us / np.sqrt(np.sum(us**2, axis=0))[None, :]
-        return Ds, us
+    return _CAMLOS_RETURNAS[_CAMLOS_RETURNAS_KEY[returnas]](
+        nD=nD, Ds=Ds, pinhole=pinhole, d1=d1, d2=d2,
+        indflat2img=indflat2img, indimg2flat=indimg2flat,
+        Name=Name, Exp=Exp, Diag=Diag, method=method,
+        etendues=etendues, surfaces=surfaces, dchans=dchans,
+        color=color, config=config, SavePath=SavePath,
+    )
 
-    else:
-        cls = eval('_core.CamLOS{0:01.0f}D'.format(nD))
-        cam = cls(
-            Name=Name, Exp=Exp, Diag=Diag,
-            dgeom={'pinhole': pinhole, 'D': Ds}, method=method,
-            Etendues=etendues, Surfaces=surfaces, dchans=dchans,
-            color=color, config=config, SavePath=SavePath
-        )
-        return cam
+
+_CAMLOS_SIG = inspect.signature(_create_CamLOS)
 
 
 def create_CamLOS1D(**kwdargs):
     return _create_CamLOS(nD=1, **kwdargs)
 
-create_CamLOS1D.__signature__ = inspect.signature(_create_CamLOS)
+create_CamLOS1D.__signature__ = _CAMLOS_SIG
 create_CamLOS1D.__doc__ = _createCamstr.format('1')
 
 def create_CamLOS2D(**kwdargs):
     return _create_CamLOS(nD=2, **kwdargs)
 
-create_CamLOS2D.__signature__ = inspect.signature(_create_CamLOS)
+create_CamLOS2D.__signature__ = _CAMLOS_SIG
 create_CamLOS2D.__doc__ = _createCamstr.format('2')
@@ -1107,7 +1107,7 @@ def fit2d_plot(dout=None):
         else:
             fit1d, lambfit, phiminmax = None, None, None
 
-        dax = _plot_optics.CrystalBragg_plot_data_fit2d(
+        dax = _plot.CrystalBragg_plot_data_fit2d(
             xi=xi, xj=xj, data=dfit2d['data'],
             lamb=dfit2d['lamb'], phi=dfit2d['phi'], indspect=indspect,
             indok=indok, dfit2d=dfit2d,
@@ -4,9 +4,14 @@ This module contains tests for tofu.geom in its structured version
 
 # External modules
 import os
+import gc
 import numpy as np
 import matplotlib.pyplot as plt
 
+# ToFu-specific
+import tofu.geom._comp as _comp
+import tofu.geom.utils as tfu
+
 
 
 #######################################################
@@ -25,3 +30,216 @@ def teardown_module(module):
     #print ("teardown_module after everything in this file")
     #print ("") # this is to get a newline
     pass
+
+
+#######################################################
+#
+#     Testing
+#
+#######################################################
+
+
+def test01_coords_transform():
+
+    # points in (R, phi, Z), i.e. cocos 11
+    npts = 20
+    pts11 = np.array([
+        np.linspace(1., 3., npts),
+        np.linspace(-3., 3., npts),
+        np.linspace(-1., 1., npts),
+    ])
+    xyz = np.array([
+        pts11[0, :]*np.cos(pts11[1, :]),
+        pts11[0, :]*np.sin(pts11[1, :]),
+        pts11[2, :],
+    ])
+
+    # identity
+    assert tfu.coords_transform(pts11, '11', '11') is pts11
+
+    # cocos <=> cartesian
+    out = tfu.coords_transform(pts11, '11', 'xyz')
+    assert np.allclose(out, xyz)
+    out = tfu.coords_transform(xyz, 'cart', '11')
+    assert np.allclose(out, pts11)
+
+    # cocos 12: (R, Z, phi) with phi reversed
+    pts12 = np.array([pts11[0, :], pts11[2, :], -pts11[1, :]])
+    assert np.allclose(tfu.coords_transform(pts11, '11', '12'), pts12)
+    assert np.allclose(tfu.coords_transform(pts12, '12', 'xyz'), xyz)
+
+    # round trip through all cocos
+    for cc in ['1', '2', '5', '8', '11', '14', '16', '18']:
+        out = tfu.coords_transform(xyz, 'xyz', cc)
+        out = tfu.coords_transform(out, cc, '11')
+        out = tfu.coords_transform(out, '11', cc)
+        out = tfu.coords_transform(out, cc, 'xyz')
+        assert np.allclose(out, xyz)
+
+    # wrong flags, even identical
+    for cc in ['bad', '9', '19', 11]:
+        try:
+            tfu.coords_transform(pts11, cc, cc)
+            raise Exception('coords flag {} should be rejected!'.format(cc))
+        except tfu.CoordinateInputError:
+            pass
+
+
+def test02_PinholeCam_cache():
+
+    kwdargs = dict(P=[3., 0., 0.], F=0.1, D12=0.1, N12=10, angs=0.)
+    out0 = tfu._get_PinholeCam_cached(**kwdargs)
+    out1 = tfu._get_PinholeCam_cached(**kwdargs)
+    assert all([
+        np.allclose(o0, o1) if isinstance(o0, np.ndarray) else o0 == o1
+        for o0, o1 in zip(out0, out1)
+    ])
+
+    # returns copies, the cache cannot be corrupted
+    out1[0][:] = 0.
+    assert np.allclose(tfu._get_PinholeCam_cached(**kwdargs)[0], out0[0])
+
+    # invalid inputs are still rejected, even if equivalent to a cached one
+    for k0, v0 in [('F', [0.1]), ('D12', [0.1]), ('angs', [0.])]:
+        try:
+            tfu._get_PinholeCam_cached(**dict(kwdargs, **{k0: v0}))
+            raise Exception('{} = {} should be rejected!'.format(k0, v0))
+        except AssertionError:
+            pass
+
+
+def test03_create_CamLOS_dtype():
+
+    kwdargs = dict(
+        pinhole=[3., 0., 0.], focal=0.1, sensor_size=0.1,
+        orientation=[np.pi, 0., 0.],
+    )
+    for func, nD in [(tfu.create_CamLOS1D, 1), (tfu.create_CamLOS2D, 2)]:
+        sensor_nb = 10 if nD == 1 else [10, 5]
+        D0, u0 = func(sensor_nb=sensor_nb, returnas='Du', **kwdargs)
+        assert D0.dtype == np.float64 and u0.dtype == np.float64
+
+        # float32 is kept by 'Du' and dict outputs
+        D1, u1 = func(
+            sensor_nb=sensor_nb, returnas='Du', dtype=np.float32, **kwdargs
+        )
+        dout = func(
+            sensor_nb=sensor_nb, returnas=dict, dtype=np.float32, **kwdargs
+        )
+        assert D1.dtype == np.float32 and u1.dtype == np.float32
+        assert dout['D'].dtype == np.float32
+        assert np.allclose(D1, D0, rtol=1.e-6, atol=1.e-6)
+        assert np.allclose(u1, u0, rtol=1.e-6, atol=1.e-6)
+        assert np.allclose(np.sum(u1**2, axis=0), 1., rtol=1.e-6)
+
+
+def test04_LOS_get_sample_blocks():
+
+    D = np.array([3., 0., 0.])
+    u = np.array([-1., 0.5, 0.2])
+    u = u / np.linalg.norm(u)
+    DL = [0.5, 2.]
+
+    Pts, k, dLr = _comp.LOS_get_sample(D, u, 0.03, DL=DL, method='sum')
+    for block in [7, 50, 1000]:
+        lPts, lk, ldLr = [], [], []
+        for pp, kk, dd in _comp.LOS_get_sample_blocks(
+            D, u, 0.03, DL=DL, block=block,
+        ):
+            assert pp.shape == (3, kk.size) and kk.size <= block
+            lPts.append(np.copy(pp))
+            lk.append(kk)
+            ldLr.append(dd)
+        assert np.allclose(np.concatenate(lPts, axis=1), Pts)
+        assert np.allclose(np.concatenate(lk), k)
+        assert np.allclose(ldLr, dLr)
+
+    # float32
+    Pts32, k32, dLr32 = _comp.LOS_get_sample(
+        D, u, 0.03, DL=DL, method='sum', dtype=np.float32,
+    )
+    assert Pts32.dtype == np.float32
+    assert np.allclose(Pts32, Pts, rtol=1.e-6, atol=1.e-6)
+    for pp, kk, dd in _comp.LOS_get_sample_blocks(
+        D, u, 0.03, DL=DL, block=7, dtype=np.float32,
+    ):
+        assert pp.dtype == np.float32
+
+
+def test05_LOS_calc_signal():
+
+    D = np.array([3., 0., 0.])
+    u = np.array([-1., 0.5, 0.2])
+    u = u / np.linalg.norm(u)
+    DL = [0.5, 2.]
+
+    # nan in part of the domain, ignored by the integration
+    def ff1(pts):
+        val = np.exp(-np.sum(pts**2, axis=0))
+        val[pts[2, :] > 0.3] = np.nan
+        return val
+
+    # ff may modify its second argument in place
+    def ff2(pts, vect):
+        assert vect.shape == pts.shape
+        assert np.allclose(vect, -u[:, None])
+        vect *= 2.
+        return np.sum(pts**2, axis=0) * vect[0, :]
+
+    # more points than _comp._LOS_NPTS_BLOCK => streamed by blocks
+    for dL in [0.03, 1.e-5]:
+        Pts, k, dLr = _comp.LOS_get_sample(D, u, dL, DL=DL, method='sum')
+        for ff, ref in [
+            (ff1, ff1(Pts)),
+            (ff2, np.sum(Pts**2, axis=0) * (-2.*u[0])),
+        ]:
+            ref = np.nansum(ref) * dLr
+            sig = _comp.LOS_calc_signal(ff, D, u, dL, DL=DL, method='sum')
+            assert np.allclose(sig, ref)
+
+            # float32 points, accumulated in float64
+            sig32 = _comp.LOS_calc_signal(
+                ff, D, u, dL, DL=DL, method='sum', dtype=np.float32,
+            )
+            assert np.allclose(sig32, ref, rtol=1.e-5)
+
+    # nb. of args cached per ff, without keeping ff alive
+    assert _comp._LOS_CALC_SIGNAL_FF_NARGS[ff1] == 1
+    assert _comp._LOS_CALC_SIGNAL_FF_NARGS[ff2] == 2
+    nn = len(_comp._LOS_CALC_SIGNAL_FF_NARGS)
+    _comp.LOS_calc_signal(lambda pts: pts[0, :], D, u, 0.03, DL=DL)
+    gc.collect()
+    assert len(_comp._LOS_CALC_SIGNAL_FF_NARGS) == nn
+
+    # consistent with the one-shot methods
+    sig = _comp.LOS_calc_signal(ff1, D, u, 0.03, DL=DL, method='sum')
+    out = _comp.LOS_calc_signal(ff1, D, u, 0.03, DL=DL, method='romb')
+    assert np.abs(out - sig) < 0.05 * np.abs(sig)
+
+
+def test06_create_CamLOS_case():
+
+    # shipped test case, nIn normalized at import
+    dcase = tfu._dcam['V10']
+    D0, u0 = tfu.create_CamLOS2D(case='V10', returnas='Du')
+    assert D0.shape == u0.shape == (3, np.prod(dcase['N12']))
+    assert np.allclose(np.sum(u0**2, axis=0), 1.)
+
+    # same camera from explicit parameters, non-unit nIn
+    D1, u1 = tfu.create_CamLOS2D(
+        pinhole=dcase['P'], focal=dcase['F'],
+        sensor_size=dcase['D12'], sensor_nb=dcase['N12'],
+        nIn=3.*dcase['nIn'], returnas='Du',
+    )
+    assert np.allclose(D0, D1) and np.allclose(u0, u1)
+
+    # user-provided dcam, passed through to the checks
+    dcam = {'cam0': dict(dcase, N12=[3, 2])}
+    D2, u2 = tfu.create_CamLOS2D(case='cam0', dcam=dcam, returnas='Du')
+    assert D2.shape == (3, 6)
+
+    try:
+        tfu.create_CamLOS2D(case='cam1', dcam=dcam, returnas='Du')
+        raise Exception('Unknown case not detected!')
+    except Exception as err:
+        assert 'not a known test case' in str(err)
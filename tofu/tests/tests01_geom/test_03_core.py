@@ -520,6 +520,16 @@ class Test01_Struct(object):
                                        + "\t- ind = {}".format(ind0))
                                 raise Exception(msg)
 
+                    # domain outside of the (R, Z) bounding box => no point
+                    if typ == 'Tor':
+                        out = obj.get_sampleV(0.1, resMode='abs',
+                                              domain=[[100., 101.], None,
+                                                      None],
+                                              returnas='(X,Y,Z)',
+                                              algo='new')
+                        assert out[0].shape == (3, 0)
+                        assert out[2].size == 0
+
     def test16_plot(self):
         for typ in self.dobj.keys():
             for c in self.dobj[typ].keys():
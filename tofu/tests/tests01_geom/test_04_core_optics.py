@@ -4,6 +4,8 @@ This module contains tests for tofu.geom in its structured version
 
 # External modules
 import os
+import sys
+import subprocess
 import itertools as itt
 import numpy as np
 import matplotlib.pyplot as plt
@@ -433,3 +435,42 @@ class Test01_Crystal(object):
             # Just to check the loaded version works fine
             obj2.strip(0)
             os.remove(pfe)
+
+
+#######################################################
+#
+#     Lazy import of optics
+#
+#######################################################
+
+
+class Test02_LazyImport(object):
+
+    def test01_optics(self):
+
+        # fresh interpreter: optics only imported on first access
+        code = (
+            "import sys\n"
+            "import tofu.geom as tfg\n"
+            "assert 'tofu.geom._core_optics' not in sys.modules\n"
+            "ldir = dir(tfg)\n"
+            "assert 'CrystalBragg' in ldir and '_plot_optics' in ldir\n"
+            "assert tfg._plot_optics.__name__ == 'tofu.geom._plot_optics'\n"
+            "assert tfg._comp_optics.__name__ == 'tofu.geom._comp_optics'\n"
+            "assert tfg.CrystalBragg.__module__ == 'tofu.geom._core_optics'\n"
+            "assert tfg._core_optics.CrystalBragg is tfg.CrystalBragg\n"
+            "import tofu.spectro as tfs\n"
+            "assert callable(tfs._plot.CrystalBragg_plot_data_fit2d)\n"
+            "assert callable(tfs._fit12d._plot.CrystalBragg_plot_data_fit2d)\n"
+            "try:\n"
+            "    tfg.CrystalBraggg\n"
+            "    raise Exception('Unknown attribute not detected!')\n"
+            "except AttributeError:\n"
+            "    pass\n"
+        )
+        out = subprocess.run(
+            [sys.executable, '-c', code],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        assert out.returncode == 0, out.stderr.decode()
@@ -4,7 +4,9 @@ This module contains tests for tofu.geom in its structured version
 
 # Built-in
 import os
+import sys
 import shutil
+import subprocess
 import itertools as itt
 import warnings
 
@@ -18,6 +20,7 @@ import matplotlib.pyplot as plt
 from tofu import __version__
 import tofu as tf
 import tofu.data as tfd
+import tofu.data._mesh_bsplines_rect as _mesh_bsplines_rect
 
 
 _HERE = os.path.abspath(os.path.dirname(__file__))
@@ -375,17 +378,11 @@ class Test02_Mesh2D():
                 imshow=False,
             )
             indok = ~np.isnan(val_sum[0, ...])
-
-            # !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-            # Does not work because of knots padding used in func_details
-            # Due to scpinterp._bspl.evaluate_spline()...
-            if False:   # To be debugged
-                assert np.allclose(
-                    val_sum[0, indok],
-                    np.nansum(val, axis=-1)[indok],
-                    equal_nan=True,
-                )
-            # !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
+            assert np.allclose(
+                val_sum[0, indok],
+                np.nansum(val, axis=-1)[indok],
+                equal_nan=True,
+            )
 
         # triangular meshes
         lkey = ['tri0-bs0', 'tri1-bs1']
@@ -604,3 +601,284 @@ class Test02_Mesh2D():
                 cam=cam, indchan=12, indbf=100,
             )
             plt.close('all')
+
+
+#######################################################
+#
+#     Rectangular bsplines - evaluation
+#
+#######################################################
+
+
+class Test03_BSplinesRect():
+
+    @classmethod
+    def setup_class(cls):
+
+        # non-uniform knots
+        Rknots = np.r_[2., 2.1, 2.3, 2.35, 2.6, 2.8, 3.]
+        Zknots = np.r_[-1., -0.6, -0.5, 0., 0.2, 0.7, 1.]
+
+        # points: inside, on the knots (inc. edges) and outside the mesh
+        R = np.r_[np.linspace(1.9, 3.1, 13), Rknots]
+        Z = np.r_[np.linspace(-1.1, 1.1, 9), Zknots]
+        cls.R = np.repeat(R[:, None], Z.size, axis=1)
+        cls.Z = np.repeat(Z[None, :], R.size, axis=0)
+        cls.indout = (
+            (cls.R < Rknots[0]) | (cls.R > Rknots[-1])
+            | (cls.Z < Zknots[0]) | (cls.Z > Zknots[-1])
+        )
+
+        # one set of functions per degree
+        cls.dfunc = {}
+        for deg in [0, 1, 2, 3]:
+            shapebs, _, _, kpbsR, kpbsZ = _mesh_bsplines_rect.get_bs2d_RZ(
+                deg=deg, Rknots=Rknots, Zknots=Zknots,
+            )
+            func_details, func_sum, clas = _mesh_bsplines_rect.get_bs2d_func(
+                deg=deg,
+                Rknots=Rknots,
+                Zknots=Zknots,
+                shapebs=shapebs,
+                knots_per_bs_R=kpbsR,
+                knots_per_bs_Z=kpbsZ,
+            )
+
+            # coefs for 3 time steps and random crop
+            rng = np.random.default_rng(deg)
+            coefs = rng.random((3,) + shapebs)
+            cropbs = rng.random(shapebs) > 0.3
+
+            # all bsplines, flat indices
+            indbs = (
+                np.repeat(np.arange(0, shapebs[0]), shapebs[1]),
+                np.tile(np.arange(0, shapebs[1]), shapebs[0]),
+            )
+
+            cls.dfunc[deg] = {
+                'shapebs': shapebs,
+                'func_details': func_details,
+                'func_sum': func_sum,
+                'class': clas,
+                'coefs': coefs,
+                'cropbs': cropbs,
+                'indbs': indbs,
+            }
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    @staticmethod
+    def _get_kernels():
+        """ Return the available evaluation paths (module attributes) """
+        nb = _mesh_bsplines_rect._get_nb()
+        cy = _mesh_bsplines_rect._mesh_bsplines_rect_cy
+        lk = [('dmat', False, False)]
+        if nb is not False:
+            lk.append(('numba', nb, False))
+        if cy is not False:
+            lk.append(('cython', False, cy))
+        return lk
+
+    def _ev_sum_with(self, nb, cy, func, *args, **kwdargs):
+        """ Call func with the given kernels (False => not available) """
+        nb0 = _mesh_bsplines_rect._mesh_bsplines_rect_nb
+        cy0 = _mesh_bsplines_rect._mesh_bsplines_rect_cy
+        try:
+            _mesh_bsplines_rect._mesh_bsplines_rect_nb = nb
+            _mesh_bsplines_rect._mesh_bsplines_rect_cy = cy
+            return func(*args, **kwdargs)
+        finally:
+            _mesh_bsplines_rect._mesh_bsplines_rect_nb = nb0
+            _mesh_bsplines_rect._mesh_bsplines_rect_cy = cy0
+
+    def test01_ev_sum_kernels(self):
+
+        for deg, dd in self.dfunc.items():
+
+            # reference: dense details, from the design matrix
+            details = dd['func_details'](
+                self.R, self.Z, indbs_tuple_flat=dd['indbs'], reshape=False,
+            )
+            coefs = dd['coefs'] * dd['cropbs'][None, ...]
+            ref = details.dot(coefs.reshape((coefs.shape[0], -1)).T).T
+            ref = ref.reshape((coefs.shape[0],) + self.R.shape)
+            ref[:, self.indout] = np.nan
+
+            # scipy, independent implementation (deg >= 1 only)
+            if deg > 0:
+                for tt in range(coefs.shape[0]):
+                    val = dd['class'](
+                        self.R, self.Z, coefs=coefs[tt, ...], grid=False,
+                    )
+                    assert np.allclose(val, ref[tt], equal_nan=True)
+
+            # each available kernel, inc. none (design matrix only)
+            for name, nb, cy in self._get_kernels():
+                val = self._ev_sum_with(
+                    nb, cy, dd['func_sum'],
+                    self.R, self.Z,
+                    coefs=dd['coefs'], crop=True, cropbs=dd['cropbs'],
+                )
+                assert val.shape == ref.shape, name
+                assert np.allclose(val, ref, equal_nan=True), name
+
+                # scalar coefs => partition of unity inside the mesh
+                val = self._ev_sum_with(
+                    nb, cy, dd['func_sum'], self.R, self.Z, coefs=2.,
+                )
+                assert val.shape == (1,) + self.R.shape, name
+                assert np.allclose(val[0, ~self.indout], 2.), name
+                assert np.all(np.isnan(val[0, self.indout])), name
+
+    def test02_ev_sum_out(self):
+
+        for deg, dd in self.dfunc.items():
+            for name, nb, cy in self._get_kernels():
+
+                lcase = [
+                    (2., None),
+                    (2., dd['cropbs']),
+                    (dd['coefs'], None),
+                    (dd['coefs'], dd['cropbs']),
+                ]
+                for coefs, cropbs in lcase:
+                    kwdargs = {
+                        'coefs': coefs,
+                        'crop': cropbs is not None,
+                        'cropbs': cropbs,
+                    }
+                    ref = self._ev_sum_with(
+                        nb, cy, dd['func_sum'], self.R, self.Z, **kwdargs,
+                    )
+
+                    out = np.full(ref.shape, -1.)
+                    val = self._ev_sum_with(
+                        nb, cy, dd['func_sum'], self.R, self.Z,
+                        out=out, **kwdargs,
+                    )
+                    assert val is out, name
+                    assert np.allclose(out, ref, equal_nan=True), name
+
+                    # wrong shape or dtype
+                    for out in [
+                        np.zeros(ref.shape[1:]),
+                        np.zeros(ref.shape, dtype=np.float32),
+                    ]:
+                        try:
+                            self._ev_sum_with(
+                                nb, cy, dd['func_sum'], self.R, self.Z,
+                                out=out, **kwdargs,
+                            )
+                            raise Exception('Wrong out not detected!')
+                        except Exception as err:
+                            assert 'Arg out' in str(err), name
+
+    def test03_ev_details_sparse(self):
+
+        for deg, dd in self.dfunc.items():
+
+            # all bsplines, then a subset
+            nbs = dd['indbs'][0].size
+            lind = [
+                dd['indbs'],
+                (dd['indbs'][0][::3], dd['indbs'][1][::3]),
+            ]
+            for indbs in lind:
+                dense = dd['func_details'](
+                    self.R, self.Z, indbs_tuple_flat=indbs, reshape=False,
+                )
+                sparse = dd['func_details'](
+                    self.R, self.Z, indbs_tuple_flat=indbs, returnas='sparse',
+                )
+                assert sparse.shape == (self.R.size, indbs[0].size)
+                assert sparse.nnz <= self.R.size * (deg + 1)**2
+                assert np.allclose(sparse.toarray(), dense)
+
+                # reshape is ignored
+                sparse2 = dd['func_details'](
+                    self.R, self.Z,
+                    indbs_tuple_flat=indbs, reshape=True, returnas='sparse',
+                )
+                assert sparse2.shape == sparse.shape
+
+            # all bsplines => sum is the partition of unity inside the mesh
+            sparse = dd['func_details'](
+                self.R, self.Z, indbs_tuple_flat=lind[0], returnas='sparse',
+            )
+            tot = np.asarray(sparse.sum(axis=1)).ravel()
+            assert np.allclose(tot[~self.indout.ravel()], 1.)
+            assert np.allclose(tot[self.indout.ravel()], 0.)
+            assert sparse.shape[1] == nbs
+
+    def test04_design_matrix(self):
+
+        for deg, dd in self.dfunc.items():
+
+            # explicitly re-used design matrix
+            dmat = dd['class'].get_design_matrix(self.R, self.Z)
+            kwdargs = {
+                'coefs': dd['coefs'], 'crop': True, 'cropbs': dd['cropbs'],
+            }
+            ref = self._ev_sum_with(
+                False, False, dd['func_sum'], self.R, self.Z, **kwdargs,
+            )
+            val = dd['func_sum'](self.R, self.Z, dmat=dmat, **kwdargs)
+            assert np.allclose(val, ref, equal_nan=True)
+
+            ref = dd['func_details'](
+                self.R, self.Z, indbs_tuple_flat=dd['indbs'],
+            )
+            val = dd['func_details'](
+                self.R, self.Z, indbs_tuple_flat=dd['indbs'], dmat=dmat,
+            )
+            assert np.allclose(val, ref)
+
+            # not cached: points modified in-place are taken into account
+            R = np.copy(self.R)
+            val0 = self._ev_sum_with(
+                False, False, dd['func_sum'], R, self.Z, **kwdargs,
+            )
+            R += 0.05
+            val1 = self._ev_sum_with(
+                False, False, dd['func_sum'], R, self.Z, **kwdargs,
+            )
+            ref = self._ev_sum_with(
+                False, False, dd['func_sum'], self.R + 0.05, self.Z,
+                **kwdargs,
+            )
+            assert np.allclose(val1, ref, equal_nan=True)
+            assert not np.allclose(val1, val0, equal_nan=True)
+
+            # wrong design matrix
+            try:
+                dd['func_sum'](
+                    self.R[:-1, :], self.Z[:-1, :], dmat=dmat, **kwdargs,
+                )
+                raise Exception('Wrong dmat not detected!')
+            except Exception as err:
+                assert 'Arg dmat' in str(err)
+
+    def test05_numba_lazy_import(self):
+
+        # fresh interpreter: numba is only imported by the first ev_sum()
+        code = (
+            "import sys\n"
+            "import numpy as np\n"
+            "import tofu.data._mesh_bsplines_rect as bs\n"
+            "assert 'numba' not in sys.modules\n"
+            "assert bs._mesh_bsplines_rect_nb is None\n"
+            "_, func_sum, _ = bs.get_bs2d_func(\n"
+            "    deg=1, Rknots=np.r_[1., 2., 3.], Zknots=np.r_[0., 1., 2.],\n"
+            "    shapebs=(3, 3),\n"
+            ")\n"
+            "func_sum(np.r_[1.5], np.r_[0.5], coefs=np.ones((1, 3, 3)))\n"
+            "assert bs._mesh_bsplines_rect_nb is not None\n"
+        )
+        out = subprocess.run(
+            [sys.executable, '-c', code],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        assert out.returncode == 0, out.stderr.decode()